@@ -203,8 +203,6 @@ Only include keys if they are mentioned. Example: {{"drug": "aspirin", "conditio
             return self._generate_template_response(intent, entities)
         
         try:
-            client = self.api_client.get_client()
-            
             # Build context from conversation history
             context_messages = [
                 {"role": "system", "content": """You are PharmaGenie AI Voice Assistant. 
@@ -221,14 +219,16 @@ Only include keys if they are mentioned. Example: {{"drug": "aspirin", "conditio
             # Current query
             context_messages.append({"role": "user", "content": text})
             
-            response = client.chat.completions.create(
-                model=self.api_client.get_model(),
-                messages=context_messages,
+            # Stream so a stalled provider is abandoned early
+            deltas = []
+            async for delta in self.api_client.achat_completion_stream(
+                context_messages,
                 temperature=0.4,
                 max_tokens=150
-            )
+            ):
+                deltas.append(delta)
             
-            response_text = (response.choices[0].message.content or "").strip()
+            response_text = "".join(deltas).strip()
             
             # Generate suggested actions
             suggested_actions = self._get_suggested_actions(intent, entities)
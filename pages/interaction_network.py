@@ -9,9 +9,12 @@ import streamlit as st
 import plotly.graph_objects as go
 import networkx as nx
 import numpy as np
+import requests
 from typing import Dict, List, Tuple
 import logging
 
+from utils.drug_info_fetcher import DrugInfoFetcher
+
 logger = logging.getLogger(__name__)
 
 class InteractionNetworkVisualizer:
@@ -45,6 +48,9 @@ class InteractionNetworkVisualizer:
             "ibuprofen": {"half_life": 2, "tmax": 1.5, "metabolism": "CYP2C9"},
             "lisinopril": {"half_life": 12, "tmax": 7, "metabolism": "renal"},
         }
+        
+        # Live interaction lookups for pairs missing from the table above
+        self.drug_fetcher = DrugInfoFetcher()
     
     def create_interaction_network(self, drug_list: List[str]) -> go.Figure:
         """
@@ -83,6 +89,18 @@ class InteractionNetworkVisualizer:
                     'level': interaction['level']
                 })
         
+        # Add interactions reported by RxNav for pairs the table doesn't cover
+        for drug1, drug2, description in self._reported_interactions(drug_list):
+            if G.has_edge(drug1, drug2):
+                continue
+            G.add_edge(drug1, drug2, severity='reported', mechanism=description, level=None)
+            interaction_data.append({
+                'drugs': f"{drug1} ↔ {drug2}",
+                'severity': 'reported',
+                'mechanism': description,
+                'level': None
+            })
+        
         # Generate 3D layout
         pos = nx.spring_layout(G, dim=3, k=2, iterations=50)
         
@@ -111,6 +129,47 @@ class InteractionNetworkVisualizer:
         
         return fig, interaction_data
     
+    def _reported_interactions(self, drug_list: List[str]) -> List[Tuple[str, str, str]]:
+        """
+        Look up interactions among the selected drugs in RxNav, falling back to FDA labels.
+        
+        Every pair is covered by one interaction/list.json call. If RxNav
+        reports none, the drugs' FDA labels are fetched in one batched search
+        and each label's drug interactions section is checked for the others.
+        Drug classes such as "SSRI" have no RxCUI and are skipped by RxNav.
+        
+        Args:
+            drug_list: List of drugs to check
+            
+        Returns:
+            List of (drug, interacting drug, description) tuples with lowercase names
+        """
+        names = [drug.lower() for drug in drug_list]
+        reported = []
+        try:
+            rxcuis = {}
+            for name in names:
+                rxcui = self.drug_fetcher.get_rxcui(name)
+                if rxcui:
+                    rxcuis[rxcui] = name
+            
+            for rxcui, interactions in self.drug_fetcher.get_drug_interactions_many(list(rxcuis)).items():
+                for interaction in interactions:
+                    # RxNav names the ingredient, e.g. "warfarin sodium" for "warfarin"
+                    other = next((name for name in names if name in interaction['drug'].lower()), None)
+                    if other and other != rxcuis[rxcui]:
+                        reported.append((rxcuis[rxcui], other, interaction['description']))
+            
+            if not reported:
+                for name, label in self.drug_fetcher.fetch_many(names).items():
+                    label_text = " ".join(label.get('drug_interactions') or []).lower()
+                    for other in names:
+                        if other != name and other in label_text:
+                            reported.append((name, other, f"Listed in the drug interactions section of the {name} FDA label"))
+        except requests.RequestException as e:
+            logger.warning(f"Error looking up interactions for {', '.join(names)}: {str(e)}")
+        return reported
+    
     def _create_node_trace(self, G, pos, drug_list):
         """Create node trace for drugs."""
         node_x = []
@@ -155,7 +214,8 @@ class InteractionNetworkVisualizer:
         severity_colors = {
             'major': 'red',
             'moderate': 'orange',
-            'minor': 'yellow'
+            'minor': 'yellow',
+            'reported': 'gray'
         }
         
         for severity, color in severity_colors.items():
@@ -368,12 +428,14 @@ def render_interaction_network_page():
             
             for interaction in interactions:
                 severity = interaction['severity']
-                color = {"major": "🔴", "moderate": "🟠", "minor": "🟡"}[severity]
+                color = {"major": "🔴", "moderate": "🟠", "minor": "🟡", "reported": "⚪"}[severity]
                 
                 with st.expander(f"{color} {interaction['drugs']} - {severity.upper()}"):
                     st.write(f"**Mechanism:** {interaction['mechanism']}")
-                    st.write(f"**Severity Level:** {interaction['level']:.0%}")
-                    st.progress(interaction['level'])
+                    # Interactions reported by RxNav carry no severity score
+                    if interaction['level'] is not None:
+                        st.write(f"**Severity Level:** {interaction['level']:.0%}")
+                        st.progress(interaction['level'])
         else:
             st.info("No known interactions detected between selected drugs.")
     
@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+SEP = "=" * 60
+
 # Test results tracker
 test_results = {
     "passed": [],
@@ -19,12 +21,12 @@ test_results = {
 
 def log_test(test_name: str, status: str, message: str = ""):
     """Log test results"""
-    print(f"\n{'='*60}")
-    print(f"TEST: {test_name}")
-    print(f"STATUS: {status}")
+    lines = [f"\n{SEP}", f"TEST: {test_name}", f"STATUS: {status}"]
     if message:
-        print(f"MESSAGE: {message}")
-    print(f"{'='*60}")
+        lines.append(f"MESSAGE: {message}")
+    lines.append(SEP)
+    # Flushed per test so a later hang doesn't hide earlier results
+    print("\n".join(lines), flush=True)
     
     if status == "PASSED":
         test_results["passed"].append(test_name)
@@ -265,9 +267,9 @@ def test_dependencies():
 
 async def run_all_tests():
     """Run all tests"""
-    print("\n" + "="*60)
+    print("\n" + SEP)
     print("PHARAMAGENIE AI - PATENT FEATURES TEST SUITE")
-    print("="*60)
+    print(SEP)
     
     # Test dependencies first
     test_dependencies()
@@ -285,9 +287,9 @@ async def run_all_tests():
     test_main_app_integration()
     
     # Print summary
-    print("\n" + "="*60)
+    print("\n" + SEP)
     print("TEST SUMMARY")
-    print("="*60)
+    print(SEP)
     print(f"✅ PASSED: {len(test_results['passed'])}")
     for test in test_results['passed']:
         print(f"   - {test}")
@@ -304,7 +306,7 @@ async def run_all_tests():
     else:
         print("\n🎉 ALL TESTS PASSED!")
     
-    print("="*60)
+    print(SEP)
     
     return len(test_results['failed']) == 0
 
@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 """Test script for Voice Assistant button functionality."""
 
+SEP = "=" * 60
+
 print("🧪 Voice Assistant Button Functionality Test")
-print("=" * 60)
+print(SEP)
 
 # Test 1: Check advanced_features.py exists
 print("\n✅ Test 1: Checking files exist...")
 import os
+import re
+from pathlib import Path
+
 files_to_check = [
     "pages/advanced_features.py",
     "pages/drug_explorer.py",
@@ -14,62 +19,46 @@ files_to_check = [
     "app.py"
 ]
 
+
+def slurp(path: str) -> bytes:
+    """Read a file once as raw bytes (substring checks don't need decoding)."""
+    return Path(path).read_bytes()
+
+
+contents = {path: slurp(path) for path in files_to_check if os.path.exists(path)}
+
 for file in files_to_check:
-    if os.path.exists(file):
+    if file in contents:
         print(f"  ✅ {file} - Found")
     else:
         print(f"  ❌ {file} - Missing")
 
-# Test 2: Check navigation added
-print("\n✅ Test 2: Checking navigation updates...")
-with open("app.py", "r", encoding="utf-8") as f:
-    app_content = f.read()
-    if "💊 Drug Explorer" in app_content:
-        print("  ✅ Drug Explorer added to navigation")
-    else:
-        print("  ❌ Drug Explorer not in navigation")
-    
-    if "render_drug_explorer_page" in app_content:
-        print("  ✅ Drug Explorer route added")
-    else:
-        print("  ❌ Drug Explorer route missing")
-
-# Test 3: Check button functionality
-print("\n✅ Test 3: Checking button implementations...")
-with open("pages/advanced_features.py", "r", encoding="utf-8") as f:
-    features_content = f.read()
-    
-    buttons = [
-        "View detailed drug profile",
-        "Check side effects",
-        "See clinical trials"
-    ]
-    
-    for button in buttons:
-        if button in features_content:
-            print(f"  ✅ '{button}' button exists")
-        else:
-            print(f"  ❌ '{button}' button missing")
-    
-    if "drug_search_query" in features_content:
-        print("  ✅ Session state integration added")
-    else:
-        print("  ❌ Session state integration missing")
+# Tests 2-4: (heading, file, [(needle, message if found, message if missing)])
+CHECKS = [
+    ("\n✅ Test 2: Checking navigation updates...", "app.py", [
+        ("💊 Drug Explorer", "  ✅ Drug Explorer added to navigation", "  ❌ Drug Explorer not in navigation"),
+        ("render_drug_explorer_page", "  ✅ Drug Explorer route added", "  ❌ Drug Explorer route missing"),
+    ]),
+    ("\n✅ Test 3: Checking button implementations...", "pages/advanced_features.py", [
+        ("View detailed drug profile", "  ✅ 'View detailed drug profile' button exists", "  ❌ 'View detailed drug profile' button missing"),
+        ("Check side effects", "  ✅ 'Check side effects' button exists", "  ❌ 'Check side effects' button missing"),
+        ("See clinical trials", "  ✅ 'See clinical trials' button exists", "  ❌ 'See clinical trials' button missing"),
+        ("drug_search_query", "  ✅ Session state integration added", "  ❌ Session state integration missing"),
+    ]),
+    ("\n✅ Test 4: Checking Drug Explorer integration...", "pages/drug_explorer.py", [
+        ("render_drug_explorer_page", "  ✅ render_drug_explorer_page function exists", "  ❌ render_drug_explorer_page function missing"),
+        ("drug_search_query", "  ✅ Voice assistant integration added", "  ❌ Voice assistant integration missing"),
+    ]),
+]
 
-# Test 4: Check drug explorer integration
-print("\n✅ Test 4: Checking Drug Explorer integration...")
-with open("pages/drug_explorer.py", "r", encoding="utf-8") as f:
-    explorer_content = f.read()
-    
-    if "render_drug_explorer_page" in explorer_content:
-        print("  ✅ render_drug_explorer_page function exists")
-    else:
-        print("  ❌ render_drug_explorer_page function missing")
-    
-    if "drug_search_query" in explorer_content:
-        print("  ✅ Voice assistant integration added")
-    else:
-        print("  ❌ Voice assistant integration missing")
+for heading, path, items in CHECKS:
+    print(heading)
+    # Single scan over the file for every needle
+    needles = [needle.encode("utf-8") for needle, _, _ in items]
+    pattern = re.compile(b"|".join(re.escape(needle) for needle in needles))
+    found = set(pattern.findall(contents.get(path, b"")))
+    for needle, (_, found_msg, missing_msg) in zip(needles, items):
+        print(found_msg if needle in found else missing_msg)
 
 # Test 5: Check voice assistant response
 print("\n✅ Test 5: Testing Voice Assistant processing...")
@@ -80,33 +69,37 @@ try:
     from features.voice_assistant import VoiceAssistant
     import asyncio
 
-    assistant = VoiceAssistant()
+    async def run_voice_probes():
+        """Run every voice assistant probe inside one event loop."""
+        assistant = VoiceAssistant()
 
-    # Test command
-    test_command = "tell me about aspirin side effects"
-    print(f"  Testing command: '{test_command}'")
+        # Test command
+        test_command = "tell me about aspirin side effects"
+        print(f"  Testing command: '{test_command}'")
 
-    result = asyncio.run(assistant.process_voice_command(test_command))
-    print(f"  ✅ Intent detected: {result.intent}")
-    print(f"  ✅ Confidence: {result.confidence:.0%}")
-    print(f"  ✅ Entities: {result.entities}")
-    print(f"  ✅ Suggested actions: {len(result.suggested_actions)}")
-    
-    # Check if proper actions are suggested
-    expected_actions = ["View detailed drug profile", "Check side effects", "See clinical trials"]
-    for action in expected_actions:
-        if any(action.lower() in suggested.lower() for suggested in result.suggested_actions):
-            print(f"    ✅ Found action: {action}")
-        else:
-            print(f"    ⚠️  Missing action: {action}")
+        result = await assistant.process_voice_command(test_command)
+        print(f"  ✅ Intent detected: {result.intent}")
+        print(f"  ✅ Confidence: {result.confidence:.0%}")
+        print(f"  ✅ Entities: {result.entities}")
+        print(f"  ✅ Suggested actions: {len(result.suggested_actions)}")
+
+        # Check if proper actions are suggested
+        expected_actions = ["View detailed drug profile", "Check side effects", "See clinical trials"]
+        for action in expected_actions:
+            if any(action.lower() in suggested.lower() for suggested in result.suggested_actions):
+                print(f"    ✅ Found action: {action}")
+            else:
+                print(f"    ⚠️  Missing action: {action}")
+
+    asyncio.run(run_voice_probes())
     
 except Exception as e:
     print(f"  ⚠️  Voice Assistant test skipped (API keys needed): {str(e)[:50]}...")
     print(f"  ℹ️  This is normal - Voice Assistant works in the app with API keys")
 
-print("\n" + "=" * 60)
+print("\n" + SEP)
 print("✅ TEST SUMMARY")
-print("=" * 60)
+print(SEP)
 print("""
 All fixes have been applied:
 
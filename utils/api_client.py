@@ -5,12 +5,41 @@ Supports OpenAI, DeepSeek, and Groq APIs with automatic fallback
 """
 
 import os
+import time
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, List, Dict, Any, Deque, Callable, Tuple, AsyncIterator
 from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
+# Seconds a failed provider is skipped before it is tried again
+PROVIDER_COOLDOWN_SECONDS = 60
+# Number of recent request latencies kept per provider
+LATENCY_WINDOW = 50
+# Seconds a stream may go without a chunk before falling back
+STREAM_STALL_TIMEOUT = 5.0
+# Provider keys in fallback priority order
+PRIORITY_ORDER = ("deepseek", "groq", "openai")
+
+@dataclass
+class ProviderConfig:
+    """Configuration for one OpenAI-compatible provider."""
+    key: str
+    name: str
+    model: str
+    factory: Callable[[], OpenAI]
+    client: Optional[OpenAI] = None
+    
+    def get_client(self) -> OpenAI:
+        """Get the provider's client, creating it on first use."""
+        if self.client is None:
+            self.client = self.factory()
+        return self.client
+
 class UnifiedAPIClient:
     """
     Unified API client that supports multiple LLM providers with automatic fallback.
@@ -25,60 +54,80 @@ class UnifiedAPIClient:
             api_key: Optional API key (will auto-detect from environment if not provided)
         """
         self.providers = self._setup_providers(api_key)
-        self.current_provider = None
+        # Configured providers in fallback priority order
+        self._ordered: Tuple[ProviderConfig, ...] = tuple(
+            self.providers[key] for key in PRIORITY_ORDER if key in self.providers
+        )
+        self._current: Optional[ProviderConfig] = None
+        # provider name -> unix time until which the provider is skipped
+        self._blacklist: Dict[str, float] = {}
+        # provider name -> recent successful request latencies (seconds)
+        self._latencies: Dict[str, Deque[float]] = {}
         self._select_provider()
     
-    def _setup_providers(self, api_key: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
-        """Setup available API providers with their configurations."""
+    @property
+    def current_provider(self) -> Optional[str]:
+        """Key of the provider currently used for requests."""
+        return self._current.key if self._current else None
+    
+    def _setup_providers(self, api_key: Optional[str] = None) -> Dict[str, ProviderConfig]:
+        """
+        Setup available API providers with their configurations.
+        
+        Clients are not created here; each provider stores a factory and
+        the client is built the first time the provider is actually used.
+        """
         providers = {}
         
         # DeepSeek (Priority 1)
         deepseek_key = os.getenv("DEEPSEEK_API_KEY")
         if deepseek_key:
-            providers["deepseek"] = {
-                "client": OpenAI(
+            providers["deepseek"] = ProviderConfig(
+                key="deepseek",
+                name="DeepSeek",
+                model="deepseek-chat",
+                factory=partial(
+                    OpenAI,
                     api_key=deepseek_key,
                     base_url="https://api.deepseek.com"
-                ),
-                "model": "deepseek-chat",
-                "name": "DeepSeek"
-            }
+                )
+            )
             logger.info("✅ DeepSeek API configured")
         
         # Groq (Priority 2)
         groq_key = os.getenv("GROQ_API_KEY")
         if groq_key:
-            providers["groq"] = {
-                "client": OpenAI(
+            providers["groq"] = ProviderConfig(
+                key="groq",
+                name="Groq",
+                model="llama-3.3-70b-versatile",
+                factory=partial(
+                    OpenAI,
                     api_key=groq_key,
                     base_url="https://api.groq.com/openai/v1"
-                ),
-                "model": "llama-3.3-70b-versatile",
-                "name": "Groq"
-            }
+                )
+            )
             logger.info("✅ Groq API configured")
         
         # OpenAI (Priority 3 - Fallback)
         openai_key = api_key or os.getenv("OPENAI_API_KEY")
         if openai_key:
-            providers["openai"] = {
-                "client": OpenAI(api_key=openai_key),
-                "model": "gpt-4",
-                "name": "OpenAI"
-            }
+            providers["openai"] = ProviderConfig(
+                key="openai",
+                name="OpenAI",
+                model="gpt-4",
+                factory=partial(OpenAI, api_key=openai_key)
+            )
             logger.info("✅ OpenAI API configured")
         
         return providers
     
     def _select_provider(self):
         """Select the best available provider."""
-        priority_order = ["deepseek", "groq", "openai"]
-        
-        for provider_name in priority_order:
-            if provider_name in self.providers:
-                self.current_provider = provider_name
-                logger.info(f"🎯 Using {self.providers[provider_name]['name']} as primary provider")
-                return
+        if self._ordered:
+            self._current = self._ordered[0]
+            logger.info(f"🎯 Using {self._current.name} as primary provider")
+            return
         
         raise ValueError(
             "No API keys configured. Please set DEEPSEEK_API_KEY, GROQ_API_KEY, or OPENAI_API_KEY"
@@ -86,83 +135,239 @@ class UnifiedAPIClient:
     
     def get_client(self) -> OpenAI:
         """Get the current OpenAI-compatible client."""
-        if not self.current_provider:
+        if not self._current:
             raise ValueError("No API provider available")
-        return self.providers[self.current_provider]["client"]
+        return self._current.get_client()
     
     def get_model(self) -> str:
         """Get the model name for the current provider."""
-        if not self.current_provider:
+        if not self._current:
             raise ValueError("No API provider available")
-        return self.providers[self.current_provider]["model"]
+        return self._current.model
     
     def get_provider_name(self) -> str:
         """Get the name of the current provider."""
-        if not self.current_provider:
+        if not self._current:
             return "None"
-        return self.providers[self.current_provider]["name"]
+        return self._current.name
+    
+    def get_latency_stats(self, provider_name: Optional[str] = None) -> Dict[str, float]:
+        """
+        Get rolling p50/p99 latency for a provider.
+        
+        Args:
+            provider_name: Provider key (defaults to the current provider)
+            
+        Returns:
+            Dictionary with sample count, p50 and p99 in seconds
+        """
+        samples = sorted(self._latencies.get(provider_name or self.current_provider, ()))
+        if not samples:
+            return {"count": 0, "p50": 0.0, "p99": 0.0}
+        return {
+            "count": len(samples),
+            "p50": samples[len(samples) // 2],
+            "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        }
+    
+    def _adaptive_timeout(self, provider_name: str) -> Optional[float]:
+        """Derive a request timeout from recent p99 latency (None until enough samples)."""
+        stats = self.get_latency_stats(provider_name)
+        if stats["count"] < 5:
+            return None
+        return min(max(stats["p99"] * 3, 10.0), 120.0)
+    
+    def _is_blacklisted(self, provider_name: str) -> bool:
+        """Check whether a provider is still cooling down after a failure."""
+        return time.time() < self._blacklist.get(provider_name, 0)
+    
+    def _record_success(self, provider_name: str, latency: float):
+        """Clear a provider's cooldown and record its latency."""
+        self._blacklist.pop(provider_name, None)
+        self._latencies.setdefault(provider_name, deque(maxlen=LATENCY_WINDOW)).append(latency)
+    
+    def _record_failure(self, provider_name: str):
+        """Skip a failing provider for PROVIDER_COOLDOWN_SECONDS."""
+        self._blacklist[provider_name] = time.time() + PROVIDER_COOLDOWN_SECONDS
+    
+    def _candidate_providers(self) -> List[ProviderConfig]:
+        """Providers to try, current first, skipping ones that are cooling down."""
+        if not self._current:
+            raise ValueError("No API provider available")
+        
+        current = self._current
+        candidates = [current] + [provider for provider in self._ordered if provider is not current]
+        # If every provider is cooling down, try them all anyway
+        return [provider for provider in candidates if not self._is_blacklisted(provider.key)] or candidates
     
     def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        stream: bool = False,
         **kwargs
     ) -> Any:
         """
         Create a chat completion with automatic fallback.
         
+        Providers that failed recently are skipped until their cooldown
+        expires, so a dead provider doesn't cost its timeout on every call.
+        
         Args:
             messages: List of message dictionaries
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            stream: Return the provider's chunk iterator instead of a full response
             **kwargs: Additional parameters
             
         Returns:
-            Chat completion response
+            Chat completion response (or a chunk iterator when stream=True)
         """
-        client = self.get_client()
-        model = self.get_model()
-        
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs
-            )
-            return response
-        except Exception as e:
-            logger.error(f"Error with {self.get_provider_name()}: {e}")
+        current = self._current
+        live = self._candidate_providers()
+        if stream:
+            kwargs["stream"] = True
+        
+        last_error: Optional[Exception] = None
+        for provider in live:
+            if provider is not current:
+                logger.info(f"🔄 Falling back to {provider.name}")
+            
+            request_kwargs = dict(kwargs)
+            timeout = self._adaptive_timeout(provider.key)
+            if timeout is not None:
+                request_kwargs.setdefault("timeout", timeout)
+            
+            try:
+                started = time.monotonic()
+                response = provider.get_client().chat.completions.create(
+                    model=provider.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **request_kwargs
+                )
+                self._record_success(provider.key, time.monotonic() - started)
+                
+                if provider is not current:
+                    # Update current provider on successful fallback
+                    self._current = provider
+                    logger.info(f"✅ Successfully switched to {provider.name}")
+                return response
+            except Exception as e:
+                logger.error(f"Error with {provider.name}: {e}")
+                self._record_failure(provider.key)
+                last_error = e
+        
+        # All providers failed
+        raise Exception(f"All API providers failed. Last error: {last_error}")
+    
+    async def achat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stall_timeout: float = STREAM_STALL_TIMEOUT,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion as text deltas with automatic fallback.
+        
+        If a provider produces no chunk within stall_timeout seconds before
+        its first delta, the stream is closed and the next provider is
+        tried. Once text has been yielded a stall is raised instead, since
+        restarting on another provider would repeat the answer.
+        
+        The request is also sent with stall_timeout as the client's timeout
+        (unless the caller passes one), so a worker thread blocked on an
+        abandoned stream ends instead of holding up the default executor.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            stall_timeout: Seconds to wait for each chunk
+            **kwargs: Additional parameters
             
-            # Try fallback providers
-            priority_order = ["deepseek", "groq", "openai"]
-            for provider_name in priority_order:
-                if provider_name != self.current_provider and provider_name in self.providers:
-                    logger.info(f"🔄 Falling back to {self.providers[provider_name]['name']}")
-                    try:
-                        fallback_client = self.providers[provider_name]["client"]
-                        fallback_model = self.providers[provider_name]["model"]
-                        
-                        response = fallback_client.chat.completions.create(
-                            model=fallback_model,
-                            messages=messages,
-                            temperature=temperature,
-                            max_tokens=max_tokens,
-                            **kwargs
-                        )
-                        
-                        # Update current provider on successful fallback
-                        self.current_provider = provider_name
-                        logger.info(f"✅ Successfully switched to {self.providers[provider_name]['name']}")
-                        return response
-                    except Exception as fallback_error:
-                        logger.error(f"Fallback to {provider_name} also failed: {fallback_error}")
-                        continue
+        Yields:
+            Response text deltas
+        """
+        current = self._current
+        live = self._candidate_providers()
+        
+        last_error: Optional[Exception] = None
+        for provider in live:
+            if provider is not current:
+                logger.info(f"🔄 Falling back to {provider.name}")
             
-            # All providers failed
-            raise Exception(f"All API providers failed. Last error: {e}")
+            request_kwargs = dict(kwargs)
+            request_kwargs.setdefault("timeout", stall_timeout)
+            
+            yielded = False
+            response = None
+            try:
+                started = time.monotonic()
+                opening = asyncio.ensure_future(asyncio.to_thread(
+                    provider.get_client().chat.completions.create,
+                    model=provider.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    **request_kwargs
+                ))
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(opening), stall_timeout)
+                except asyncio.TimeoutError:
+                    # The request may still open the stream later; close it then
+                    opening.add_done_callback(_close_late_stream)
+                    raise
+                chunks = iter(response)
+                first_chunk = True
+                while True:
+                    chunk = await asyncio.wait_for(asyncio.to_thread(next, chunks, None), stall_timeout)
+                    if chunk is None:
+                        break
+                    if first_chunk:
+                        # Time to first chunk is what the caller waits on
+                        self._record_success(provider.key, time.monotonic() - started)
+                        first_chunk = False
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        yielded = True
+                        yield delta
+                
+                if provider is not current:
+                    # Update current provider on successful fallback
+                    self._current = provider
+                    logger.info(f"✅ Successfully switched to {provider.name}")
+                return
+            except asyncio.TimeoutError:
+                logger.error(f"{provider.name} stream stalled: no chunk within {stall_timeout}s")
+                self._record_failure(provider.key)
+                if yielded:
+                    raise
+                last_error = TimeoutError(f"{provider.name} stream stalled for {stall_timeout}s")
+            except Exception as e:
+                logger.error(f"Error with {provider.name}: {e}")
+                self._record_failure(provider.key)
+                if yielded:
+                    raise
+                last_error = e
+            finally:
+                # Release the HTTP connection of a finished or abandoned stream
+                if response is not None:
+                    response.close()
+        
+        # All providers failed
+        raise Exception(f"All API providers failed. Last error: {last_error}")
+
+
+def _close_late_stream(opening: "asyncio.Future") -> None:
+    """Close a stream whose request finished after the caller stopped waiting."""
+    if not opening.cancelled() and opening.exception() is None:
+        opening.result().close()
 
 # Global instance for easy access
 _global_client = None
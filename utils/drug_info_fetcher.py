@@ -4,14 +4,987 @@ Drug Information Fetcher Module
 Fetches comprehensive drug information from free APIs (RxNav and PubChem)
 """
 
+import os
+import re
+import copy
+import json
+import hashlib
+import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
-from typing import Dict, List, Optional, Tuple
-from functools import lru_cache
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from cachetools import LRUCache, TLRUCache, TTLCache
+from cachetools.keys import hashkey
 import time
 
+from utils.helpers import cache_data, get_cached_data
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# How long fetched API results are reused before hitting the network again
+CACHE_TTL_SECONDS = 600
+# How long results are kept in the shared Redis/on-disk cache (RxNav/PubChem rarely change)
+SHARED_TTL_SECONDS = 24 * 60 * 60
+# How long "not found" results are kept, so new or transiently missing drugs are retried sooner
+NEGATIVE_TTL_SECONDS = 5 * 60
+# How long an expired result may still be served while it is refreshed in the background
+STALE_GRACE_SECONDS = 60 * 60
+# Statuses retried by the HTTP adapter, and treated as transient once retries run out
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Drug names OR'd into a single openFDA label.json search
+FDA_BATCH_SIZE = 20
+# Label records requested per drug in a batch (combination products match several names)
+FDA_LABELS_PER_DRUG = 5
+# How long ETag validators are kept on disk for conditional GETs after a restart
+ETAG_TTL_SECONDS = 7 * 24 * 60 * 60
+# HTTP requests in flight across all fetchers in the process
+MAX_IN_FLIGHT_GLOBAL = 20
+
+
+
+class TransientFetchError(Exception):
+    """A source kept answering with a retryable status; the data may still exist."""
+
+
+class _Incomplete:
+    """Fallback result of a _ttl_cached method built while a source was unreachable; not cached."""
+    
+    def __init__(self, value: Any):
+        self.value = value
+
+
+# Failures that say nothing about whether the data exists: the source is skipped
+# and the fallback result is not cached
+_TRANSIENT_ERRORS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    TransientFetchError
+)
+# Malformed or unexpected response bodies
+_PARSE_ERRORS = (KeyError, IndexError, TypeError, ValueError, AttributeError)
+# Failures meaning the source has no usable answer for this request
+_PERMANENT_ERRORS = (requests.HTTPError,) + _PARSE_ERRORS
+# Failures of the on-disk cache, which only cost a cache miss
+_DISK_ERRORS = (OSError, sqlite3.Error)
+
+# RxNav property names that describe indications / mechanism (substring match)
+_INDICATION_RE = re.compile(r"indication|use|treat")
+_MECHANISM_RE = re.compile(r"mechanism|action|activity")
+# "FIELD: value" lines in the AI enhancement response
+_AI_RE = re.compile(r"^[ \t]*(DOSAGE|MECHANISM|SMILES):[ \t]*(\S[^\r\n]*?)[ \t\r]*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def _get_redis_client() -> Optional[Any]:
+    """Get the shared Redis client when REDIS_URL is set, else None."""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    if not REDIS_AVAILABLE:
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache only")
+        return None
+    return redis.Redis.from_url(redis_url, decode_responses=True)
+
+
+@lru_cache(maxsize=1)
+def _get_shared_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all DrugInfoFetcher instances.
+    
+    Pages build a new fetcher on every rerun; sharing one session keeps
+    their keep-alive connections (and TLS handshakes) in the pool.
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'PharmaGenieAI/1.0 (Educational Project)',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+    
+    # Keep enough pooled connections per host for the concurrent fan-out
+    # and retry transient failures before giving up on a call
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=list(RETRY_STATUSES),
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _frozen(value: Any) -> Any:
+    """Read-only copy of a built-in table: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+# Static knowledge base for common drugs, keyed by casefolded name
+_DRUG_KNOWLEDGE: Mapping[str, Mapping[str, str]] = _frozen({
+    'metformin': {
+        'dosage': 'Initial: 500 mg twice daily or 850 mg once daily with meals. Maximum: 2,550 mg/day in divided doses. Extended-release: 500-2,000 mg once daily with evening meal.',
+        'mechanism': 'Decreases hepatic glucose production, decreases intestinal absorption of glucose, and improves insulin sensitivity by increasing peripheral glucose uptake and utilization.',
+        'smiles': 'CN(C)C(=N)NC(=N)N'
+    },
+    'aspirin': {
+        'dosage': 'Pain/fever: 325-650 mg every 4-6 hours. Cardiovascular protection: 75-325 mg once daily. Maximum: 4,000 mg/day for pain.',
+        'mechanism': 'Inhibits cyclooxygenase (COX) enzymes, reducing prostaglandin synthesis. Irreversibly acetylates COX-1 and COX-2, preventing platelet aggregation and reducing inflammation, pain, and fever.',
+        'smiles': 'CC(=O)Oc1ccccc1C(=O)O'
+    },
+    'ibuprofen': {
+        'dosage': 'Adults: 200-400 mg every 4-6 hours as needed. Maximum: 3,200 mg/day (prescription strength) or 1,200 mg/day (OTC).',
+        'mechanism': 'Nonsteroidal anti-inflammatory drug (NSAID) that inhibits COX-1 and COX-2 enzymes, reducing prostaglandin synthesis and providing anti-inflammatory, analgesic, and antipyretic effects.',
+        'smiles': 'CC(C)Cc1ccc(cc1)C(C)C(=O)O'
+    },
+    'lisinopril': {
+        'dosage': 'Hypertension: Initial 10 mg once daily, usual range 20-40 mg/day. Heart failure: Initial 5 mg once daily, target 20-40 mg/day.',
+        'mechanism': 'ACE inhibitor that prevents conversion of angiotensin I to angiotensin II, reducing vasoconstriction and aldosterone secretion, thereby lowering blood pressure and reducing cardiac workload.',
+        'smiles': 'NCCCC[C@H](N[C@@H](CCc1ccccc1)C(=O)O)C(=O)N1CCC[C@H]1C(=O)O'
+    },
+    'atorvastatin': {
+        'dosage': 'Initial: 10-20 mg once daily. Usual range: 10-80 mg once daily. Can be taken at any time without regard to meals.',
+        'mechanism': 'HMG-CoA reductase inhibitor (statin) that competitively inhibits the rate-limiting enzyme in cholesterol biosynthesis, reducing LDL cholesterol and total cholesterol levels.',
+        'smiles': 'CC(C)c1c(c(c(n1CC[C@H](C[C@H](CC(=O)O)O)O)c2ccc(cc2)F)c3ccccc3)C(=O)Nc4ccccc4'
+    },
+    'omeprazole': {
+        'dosage': 'GERD: 20 mg once daily for 4-8 weeks. H. pylori: 20 mg twice daily (with antibiotics). Best taken before meals.',
+        'mechanism': 'Proton pump inhibitor that suppresses gastric acid secretion by irreversibly blocking the H+/K+-ATPase enzyme system in gastric parietal cells.',
+        'smiles': 'COc1ccc2c(c1)[nH]c(n2)S(=O)Cc3ncc(c(c3C)OC)C'
+    }
+})
+
+# Placeholder values meaning a field still needs to be filled in
+_MISSING_DOSAGE = frozenset({'Information not available', 'Dosage information not available'})
+_MISSING_MECHANISM = frozenset({'Information not available', 'Mechanism of action not available', 'Description not available'})
+_MISSING_EFFECTS = frozenset({None, '', 'Information not available'})
+_MISSING_SMILES = frozenset({None, '', 'Not available'})
+
+
+# Built-in fallback data for well-known drugs, keyed by lowercased name
+_COMMON_INTERACTIONS: Mapping[str, Tuple[Mapping[str, str], ...]] = _frozen({
+    "aspirin": [
+        {"drug": "Warfarin", "description": "Increased risk of bleeding. Aspirin enhances the anticoagulant effect of warfarin, which may lead to serious bleeding complications."},
+        {"drug": "Ibuprofen", "description": "Reduced cardiovascular protection. Ibuprofen may interfere with aspirin's antiplatelet effects when taken regularly."},
+        {"drug": "Naproxen", "description": "Increased risk of gastrointestinal bleeding and ulcers when NSAIDs are combined."},
+        {"drug": "Clopidogrel", "description": "Significantly increased bleeding risk. Both drugs affect platelet function, leading to enhanced antiplatelet effects."},
+        {"drug": "Methotrexate", "description": "Aspirin may increase methotrexate toxicity by reducing its renal clearance."},
+        {"drug": "ACE Inhibitors", "description": "Aspirin may reduce the effectiveness of ACE inhibitors in treating hypertension and heart failure."},
+    ],
+    "ibuprofen": [
+        {"drug": "Aspirin", "description": "Reduced cardiovascular protection from aspirin. Ibuprofen may interfere with aspirin's antiplatelet effects."},
+        {"drug": "Warfarin", "description": "Increased risk of bleeding due to antiplatelet effects and GI irritation."},
+        {"drug": "Lithium", "description": "Ibuprofen may increase lithium blood levels, potentially leading to toxicity."},
+        {"drug": "Methotrexate", "description": "Reduced renal clearance of methotrexate may lead to increased toxicity."},
+        {"drug": "ACE Inhibitors", "description": "May reduce the antihypertensive effect and increase risk of kidney problems."},
+    ],
+    "metformin": [
+        {"drug": "Contrast Dye", "description": "Increased risk of lactic acidosis. Metformin should be temporarily discontinued before and after procedures using iodinated contrast."},
+        {"drug": "Alcohol", "description": "Increased risk of lactic acidosis and may enhance blood glucose-lowering effect."},
+        {"drug": "Cimetidine", "description": "May increase metformin blood levels by reducing kidney clearance."},
+        {"drug": "Furosemide", "description": "May increase metformin levels and decrease furosemide levels through renal effects."},
+    ],
+    "warfarin": [
+        {"drug": "Aspirin", "description": "Significantly increased bleeding risk. Both drugs affect blood clotting through different mechanisms."},
+        {"drug": "NSAIDs", "description": "Increased risk of bleeding and gastric ulceration."},
+        {"drug": "Antibiotics", "description": "Many antibiotics can enhance warfarin's effect by reducing vitamin K production."},
+        {"drug": "Amiodarone", "description": "Significantly increases warfarin effect, requiring dose reduction and close INR monitoring."},
+        {"drug": "Acetaminophen", "description": "Regular use may increase INR, though occasional use is generally safe."},
+    ],
+    "lisinopril": [
+        {"drug": "NSAIDs", "description": "May reduce the antihypertensive effect and increase risk of kidney dysfunction."},
+        {"drug": "Potassium Supplements", "description": "Increased risk of hyperkalemia (high potassium levels)."},
+        {"drug": "Lithium", "description": "May increase lithium levels, potentially causing toxicity."},
+        {"drug": "Diuretics", "description": "May cause excessive blood pressure lowering, especially with first dose."},
+    ],
+    "atorvastatin": [
+        {"drug": "Grapefruit Juice", "description": "May significantly increase atorvastatin levels, raising the risk of side effects including muscle damage."},
+        {"drug": "Clarithromycin", "description": "May increase statin levels and risk of muscle toxicity (rhabdomyolysis)."},
+        {"drug": "Diltiazem", "description": "May increase atorvastatin levels, potentially requiring dose adjustment."},
+        {"drug": "Gemfibrozil", "description": "Increased risk of muscle toxicity when combined with statins."},
+    ],
+    "omeprazole": [
+        {"drug": "Clopidogrel", "description": "May reduce the effectiveness of clopidogrel by inhibiting its activation."},
+        {"drug": "Warfarin", "description": "May increase warfarin levels, requiring closer INR monitoring."},
+        {"drug": "Methotrexate", "description": "May increase methotrexate levels, especially at high doses."},
+    ],
+    "amoxicillin": [
+        {"drug": "Oral Contraceptives", "description": "May reduce the effectiveness of birth control pills."},
+        {"drug": "Warfarin", "description": "May enhance warfarin's effect, increasing bleeding risk."},
+        {"drug": "Methotrexate", "description": "May reduce methotrexate clearance, increasing toxicity risk."},
+    ],
+    "paracetamol": [
+        {"drug": "Warfarin", "description": "Regular use (4+ days) may increase INR and bleeding risk."},
+        {"drug": "Alcohol", "description": "Chronic alcohol use increases risk of liver damage from acetaminophen."},
+        {"drug": "Carbamazepine", "description": "May increase metabolism of acetaminophen, reducing effectiveness and increasing toxic metabolite formation."},
+    ],
+    "acetaminophen": [
+        {"drug": "Warfarin", "description": "Regular use (4+ days) may increase INR and bleeding risk."},
+        {"drug": "Alcohol", "description": "Chronic alcohol use increases risk of liver damage from acetaminophen."},
+        {"drug": "Isoniazid", "description": "May increase risk of liver toxicity from acetaminophen."},
+    ]
+})
+
+_COMMON_USES: Mapping[str, str] = MappingProxyType({
+    "aspirin": "Pain relief, fever reduction, anti-inflammatory, and prevention of blood clots",
+    "ibuprofen": "Pain relief, fever reduction, anti-inflammatory",
+    "paracetamol": "Pain relief and fever reduction",
+    "acetaminophen": "Pain relief and fever reduction",
+    "metformin": "Treatment of type 2 diabetes (improves insulin sensitivity)",
+    "atorvastatin": "Treatment of high cholesterol to reduce cardiovascular risk",
+    "omeprazole": "Reduction of gastric acid production for GERD and peptic ulcers",
+    "amoxicillin": "Treatment of bacterial infections (various indications)",
+    "lisinopril": "Treatment of high blood pressure and heart failure",
+    "caffeine": "Stimulant; sometimes used in headache preparations"
+})
+
+_MECHANISMS: Mapping[str, str] = MappingProxyType({
+    "aspirin": "Irreversibly inhibits cyclooxygenase (COX) enzymes, reducing prostaglandin synthesis and platelet aggregation",
+    "ibuprofen": "Reversibly inhibits COX-1 and COX-2 enzymes, reducing prostaglandin synthesis and inflammation",
+    "paracetamol": "Inhibits prostaglandin synthesis in the CNS, affecting pain and fever centers",
+    "acetaminophen": "Inhibits prostaglandin synthesis in the CNS, affecting pain and fever centers",
+    "metformin": "Decreases hepatic glucose production, decreases intestinal glucose absorption, and improves insulin sensitivity",
+    "atorvastatin": "Inhibits HMG-CoA reductase, the rate-limiting enzyme in cholesterol synthesis",
+    "lisinopril": "Inhibits angiotensin-converting enzyme (ACE), reducing angiotensin II formation and lowering blood pressure",
+    "omeprazole": "Irreversibly inhibits the H+/K+ ATPase enzyme (proton pump) in gastric parietal cells",
+    "amoxicillin": "Inhibits bacterial cell wall synthesis by binding to penicillin-binding proteins",
+    "metoprolol": "Selectively blocks beta-1 adrenergic receptors in the heart, reducing heart rate and contractility"
+})
+
+# Class keyword -> generic mechanism / common adverse effects (first match wins)
+_CLASS_MECHANISMS: Tuple[Tuple[str, str], ...] = (
+    ("analgesic", "Reduces pain perception through various mechanisms affecting pain pathways"),
+    ("antibiotic", "Inhibits bacterial growth or kills bacteria through various mechanisms"),
+    ("antihypertensive", "Lowers blood pressure through various mechanisms affecting cardiovascular system"),
+)
+
+_CLASS_EFFECTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("analgesic", ("Nausea", "Gastric irritation", "Dizziness", "Liver toxicity (overdose)")),
+    ("nsaid", ("Gastric ulceration", "Bleeding", "Renal impairment", "Cardiovascular events")),
+    ("antibiotic", ("Diarrhea", "Nausea", "Allergic reactions", "Antibiotic resistance")),
+    ("antihypertensive", ("Dizziness", "Fatigue", "Headache", "Electrolyte imbalance")),
+    ("statin", ("Muscle pain", "Liver enzyme elevation", "Digestive problems", "Memory issues")),
+    ("antidiabetic", ("Hypoglycemia", "Gastrointestinal upset", "Weight changes", "Lactic acidosis (rare)")),
+)
+
+
+def _keyword_matcher(table: Tuple[Tuple[str, Any], ...]) -> Callable[[str], Optional[Any]]:
+    """
+    Build a one-pass lookup over a (keyword, value) table.
+    
+    All keywords are compiled into a single alternation, so the text is
+    scanned once however many keywords there are; when several occur, the
+    earliest table entry still wins.
+    """
+    pattern = re.compile("|".join(re.escape(keyword) for keyword, _ in table))
+    ranks = {keyword: index for index, (keyword, _) in enumerate(table)}
+    
+    def lookup(text: str) -> Optional[Any]:
+        hits = [ranks[match.group()] for match in pattern.finditer(text)]
+        return table[min(hits)][1] if hits else None
+    
+    return lookup
+
+
+_class_mechanism = _keyword_matcher(_CLASS_MECHANISMS)
+_class_effect_list = _keyword_matcher(_CLASS_EFFECTS)
+
+
+@lru_cache(maxsize=2048)
+def _mechanism_for(drug_lower: str, class_lower: str) -> str:
+    """Mechanism of action from the built-in tables (arguments already lowercased)."""
+    if drug_lower in _MECHANISMS:
+        return _MECHANISMS[drug_lower]
+    return _class_mechanism(class_lower) or "Mechanism of action varies based on drug class and target"
+
+
+@lru_cache(maxsize=1024)
+def _class_effects(class_lower: str) -> Tuple[str, ...]:
+    """Common adverse effects for a (lowercased) drug class."""
+    return _class_effect_list(class_lower) or (
+        "Common: Nausea, headache, dizziness",
+        "Consult healthcare provider for complete list"
+    )
+
+
+# openFDA label records keyed by casefolded drug name ({} when FDA has no label)
+_FDA_LABELS: TTLCache = TTLCache(maxsize=1024, ttl=CACHE_TTL_SECONDS)
+_FDA_LABELS_LOCK = threading.Lock()
+
+# Pool shared by every fetcher for fanning out independent API calls (fetchers are
+# created per page run, so a pool per instance would leak threads)
+_FANOUT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="drug-info")
+
+# Pool for leaf PubChem requests issued from inside fetcher methods; kept apart from
+# _FANOUT_EXECUTOR, which those methods may already be running on
+_PUBCHEM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pubchem")
+
+# Process-wide budget of in-flight HTTP requests, so one batch can't drain the session pool
+_GLOBAL_REQUEST_SLOTS = threading.BoundedSemaphore(MAX_IN_FLIGHT_GLOBAL)
+
+# Conditional GET validators: (url, params) -> (ETag, parsed body), backed by the on-disk cache
+_ETAGS: LRUCache = LRUCache(maxsize=2048)
+_ETAGS_LOCK = threading.Lock()
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Decode a response body, using orjson when it is installed (FDA labels run to megabytes)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _check_status(response: requests.Response) -> None:
+    """Raise TransientFetchError for retryable statuses and HTTPError for other failures."""
+    if response.status_code in RETRY_STATUSES:
+        raise TransientFetchError(f"{response.status_code} from {response.url}")
+    response.raise_for_status()
+
+
+def _bullets(items: List[str]) -> str:
+    """Format items as a "- item" list with a single join."""
+    return "- " + "\n- ".join(items)
+
+
+def _method_key(self, *args, **kwargs):
+    """Cache key for fetcher methods that ignores the instance."""
+    return hashkey(*args, **kwargs)
+
+
+def _redis_key(func_name: str, args: tuple, kwargs: dict) -> str:
+    """Build the Redis key for a fetcher call."""
+    parts = [str(arg) for arg in args] + [f"{k}={v}" for k, v in sorted(kwargs.items())]
+    return f"drug:{func_name}:{':'.join(parts)}"
+
+
+def _disk_key(key: str) -> str:
+    """File-name-safe on-disk cache key for a shared cache key."""
+    func_name = key.split(":")[1]
+    return f"drug_{func_name}_{hashlib.sha1(key.encode()).hexdigest()}"
+
+
+def _result(value: Any, complete: bool) -> Any:
+    """Return value from a _ttl_cached method, marked uncacheable unless every source answered."""
+    return value if complete else _Incomplete(value)
+
+
+def _no_rxcui(rxcui: Optional[str]) -> bool:
+    """Whether get_rxcui found nothing."""
+    return not rxcui
+
+
+def _no_pubchem_record(info: Dict) -> bool:
+    """Whether get_pubchem_info found no compound for the name."""
+    return info.get("smiles") is None and info.get("molecular_formula") == "N/A"
+
+
+def _ttl_cached(
+    maxsize: int = 256,
+    is_miss: Optional[Callable[[Any], bool]] = None,
+    stale_grace: int = 0
+):
+    """
+    Share a method's results across fetcher instances for CACHE_TTL_SECONDS.
+    
+    In-process misses are looked up in (and written back to) the shared
+    cache: Redis when the fetcher has a client, so every worker benefits
+    from one fetch, otherwise files under data/cache, so results survive
+    restarts. Results for which is_miss returns True are only kept for
+    NEGATIVE_TTL_SECONDS at either level.
+    
+    With stale_grace, an expired result is still served for up to that many
+    seconds while a refresh runs on the fetcher's executor, so a recently
+    seen key never waits on the network.
+    
+    Callers get a deep copy of the cached result, so editing a returned
+    list or dict can't change what later callers see.
+    
+    A method that falls back because a source was unreachable returns its
+    result wrapped in _Incomplete (see _result); the caller gets the plain
+    value, but nothing is cached, so the next call asks the source again.
+    wrapper.with_status(self, ...) also returns whether the result was
+    complete.
+    """
+    def missed(value: Any) -> bool:
+        return is_miss is not None and is_miss(value)
+    
+    def lifetime(value: Any) -> int:
+        return NEGATIVE_TTL_SECONDS if missed(value) else CACHE_TTL_SECONDS
+    
+    def decorator(func):
+        def load(self, args: tuple, kwargs: dict, refresh: bool = False) -> Tuple[Any, bool]:
+            """Call func through the shared cache; a refresh skips the read."""
+            key = _redis_key(func.__name__, args, kwargs)
+            if not refresh:
+                found, value = self._read_shared(key)
+                if found:
+                    return value, True
+            
+            value = func(self, *args, **kwargs)
+            if isinstance(value, _Incomplete):
+                return value.value, False
+            self._write_shared(key, value, NEGATIVE_TTL_SECONDS if missed(value) else SHARED_TTL_SECONDS)
+            return value, True
+        
+        # key -> (value, fetched_at); entries outlive their TTL by stale_grace
+        cache = TLRUCache(maxsize=maxsize, ttu=lambda _key, entry, now: now + lifetime(entry[0]) + stale_grace)
+        lock = threading.Lock()
+        refreshing = set()
+        
+        def refresh(self, key: tuple, args: tuple, kwargs: dict) -> None:
+            try:
+                value, complete = load(self, args, kwargs, refresh=True)
+                if complete:
+                    with lock:
+                        cache[key] = (value, time.monotonic())
+                else:
+                    logger.warning(f"Background refresh of {func.__name__} could not reach every source; keeping the old result")
+            finally:
+                with lock:
+                    refreshing.discard(key)
+        
+        def with_status(self, *args, **kwargs) -> Tuple[Any, bool]:
+            """Call the method; also return whether every source it needed answered."""
+            key = _method_key(self, *args, **kwargs)
+            with lock:
+                entry = cache.get(key)
+                stale = (
+                    entry is not None
+                    and stale_grace > 0
+                    and time.monotonic() - entry[1] >= lifetime(entry[0])
+                )
+                start_refresh = stale and key not in refreshing
+                if start_refresh:
+                    refreshing.add(key)
+            
+            if entry is not None:
+                if start_refresh:
+                    _FANOUT_EXECUTOR.submit(refresh, self, key, args, kwargs)
+                return copy.deepcopy(entry[0]), True
+            
+            value, complete = load(self, args, kwargs)
+            if not complete:
+                return value, False
+            with lock:
+                cache[key] = (value, time.monotonic())
+            return copy.deepcopy(value), True
+        
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return with_status(self, *args, **kwargs)[0]
+        
+        wrapper.with_status = with_status
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# Query builders and response parsers used by DrugInfoFetcher
+
+def _common_drug_interactions(drug_name: str) -> List[Dict[str, str]]:
+    """
+    Get common drug interactions from built-in database for well-known drugs.
+    Fallback when API sources are unavailable.
+    
+    Args:
+        drug_name: Name of the drug (case-insensitive)
+        
+    Returns:
+        List of common drug interactions
+    """
+    # Normalize drug name for lookup
+    drug_lookup = drug_name.lower().strip()
+    
+    # Check if we have interactions for this drug
+    if drug_lookup in _COMMON_INTERACTIONS:
+        # Fresh dicts, so callers can't edit the shared table
+        return [dict(item) for item in _COMMON_INTERACTIONS[drug_lookup]]
+    
+    return []
+
+
+def _fda_search(drug_names: List[str]) -> str:
+    """Build an openFDA search matching any of the drug names."""
+    terms = []
+    for name in drug_names:
+        terms.append(f'openfda.generic_name:"{name}"')
+        terms.append(f'openfda.brand_name:"{name}"')
+    return f"({' OR '.join(terms)})"
+
+
+def _fda_label_params(drug_name: str) -> Dict[str, Any]:
+    """openFDA label.json query for a single drug's label."""
+    return {'search': _fda_search([drug_name]), 'limit': 1}
+
+
+def _label_names(label: Dict) -> List[str]:
+    """Casefolded generic and brand names an openFDA label is listed under."""
+    openfda = label.get('openfda', {})
+    return [name.casefold() for name in openfda.get('generic_name', []) + openfda.get('brand_name', [])]
+
+
+def _fda_interactions(label: Dict) -> List[Dict[str, str]]:
+    """Interaction warnings from an openFDA label record."""
+    return [
+        {"drug": "FDA Interaction Warning", "description": interaction.strip()}
+        for interaction in label.get('drug_interactions') or []
+    ]
+
+
+def _parse_rxcui(data: Dict) -> Optional[str]:
+    """First RxCUI in an RxNav rxcui.json payload, or None."""
+    rxcui_list = data.get("idGroup", {}).get("rxnormId", [])
+    return rxcui_list[0] if rxcui_list else None
+
+
+def _parse_drug_class(data: Optional[Dict]) -> Optional[str]:
+    """Top 3 class names from an RxClass byRxcui.json payload, or None if it lists none."""
+    class_list = (data or {}).get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", [])
+    if not class_list:
+        return None
+    classes = [item.get("rxclassMinConceptItem", {}).get("className", "") for item in class_list]
+    return ", ".join([name for name in classes[:3] if name])
+
+
+def _parse_adverse_effects(data: Dict) -> List[str]:
+    """Unique effect names from an RxClass MED-RT (has_PE) byRxcui.json payload."""
+    effects: List[str] = []
+    seen = set()
+    for item in data.get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", []):
+        effect = item.get("rxclassMinConceptItem", {}).get("className", "")
+        if effect and effect not in seen:
+            seen.add(effect)
+            effects.append(effect)
+    return effects
+
+
+def _parse_rxnav_interactions(data: Dict) -> List[Dict[str, str]]:
+    """Extract interacting drugs from an RxNav interaction/list.json payload."""
+    interactions: List[Dict[str, str]] = []
+    for group in data.get("fullInteractionTypeGroup", []):
+        source_name = group.get("sourceName", "")
+        for interaction_type in group.get("fullInteractionType", []):
+            for pair in interaction_type.get("interactionPair", []):
+                try:
+                    # Get the other drug in the interaction
+                    concepts = pair.get("interactionConcept", [])
+                    if len(concepts) >= 2:
+                        # The second concept is usually the interacting drug
+                        other_drug = concepts[1].get("minConceptItem", {}).get("name", "")
+                        desc = pair.get("description", "").strip()
+                        
+                        if other_drug and desc:
+                            interactions.append({
+                                "drug": other_drug,
+                                "description": f"{desc} (Source: {source_name})"
+                            })
+                except (KeyError, IndexError, TypeError) as e:
+                    logger.debug(f"Skipping malformed interaction pair: {e}")
+                    continue
+    return interactions
+
+
+def _finalize_interactions(drug_name: str, interactions: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Deduplicate fetched interactions, falling back to the built-in database."""
+    # If we have interactions, deduplicate and limit to top 10
+    if interactions:
+        unique_interactions: List[Dict[str, str]] = []
+        seen = set()
+        for item in interactions:
+            if item["drug"] not in seen:
+                seen.add(item["drug"])
+                unique_interactions.append(item)
+            if len(unique_interactions) >= 10:
+                break
+        return unique_interactions
+        
+    # Try common interactions database as final fallback
+    common_interactions = _common_drug_interactions(drug_name)
+    if common_interactions:
+        return common_interactions
+        
+    # No interactions found from any source
+    return [{"drug": "No major interactions found", "description": "This drug has no major known interactions in the database. Always consult your healthcare provider before combining medications."}]
+
+
+def _extract_basic_info(data: Dict) -> Dict:
+    """Extract basic drug information from RxNav allProperties endpoint"""
+    info = {}
+    try:
+        properties = data.get("propConceptGroup", {}).get("propConcept", [])
+        
+        # Collect all indications and uses
+        indications = []
+        mechanism = []
+        
+        for prop in properties:
+            prop_name = prop.get("propName", "").lower()
+            prop_value = prop.get("propValue", "")
+            
+            if _INDICATION_RE.search(prop_name):
+                indications.append(prop_value)
+            elif _MECHANISM_RE.search(prop_name):
+                mechanism.append(prop_value)
+                
+        if indications:
+            info["indications"] = _bullets(indications)
+        if mechanism:
+            info["mechanism"] = _bullets(mechanism)
+            
+        return info
+        
+    except _PARSE_ERRORS as e:
+        logger.error(f"Error extracting basic info: {str(e)}")
+        return {}
+
+
+def _extract_indications(data: Dict) -> str:
+    """Extract indications from RxClass data"""
+    try:
+        indications = []
+        
+        # Extract from rxclassDrugInfoList
+        drug_info_list = data.get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", [])
+        for item in drug_info_list:
+            class_info = item.get("rxclassMinConceptItem", {})
+            if class_info.get("classType") == "INDICATION":
+                indications.append(class_info.get('className', ''))
+                
+        # Extract from rxclassMinConceptList as backup
+        if not indications:
+            class_info = data.get("rxclassMinConceptList", {}).get("rxclassMinConcept", [])
+            for item in class_info:
+                if item.get("classType") == "INDICATION":
+                    indications.append(item.get('className', ''))
+                    
+        return _bullets(indications) if indications else ""
+    except _PARSE_ERRORS:
+        return ""
+
+
+def _extract_dosage(data: Dict) -> str:
+    """Extract dosage information from NDC properties"""
+    try:
+        props = data.get("ndcPropertyList", {}).get("ndcProperty", [])
+        dosage_info = []
+        for prop in props:
+            if "dosage" in prop.get("propertyName", "").lower():
+                dosage_info.append(f"{prop['propertyName']}: {prop['propertyValue']}")
+        return "\n".join(dosage_info) if dosage_info else "Dosage information not available"
+    except _PARSE_ERRORS:
+        return "Dosage information not available"
+
+
+def _build_properties(basic: Optional[Dict], classes: Optional[Dict], ndc: Optional[Dict]) -> Dict:
+    """
+    Merge the RxNav payloads behind get_drug_properties.
+    
+    Args:
+        basic: allProperties.json payload (None if unavailable)
+        classes: RxClass byRxcui.json payload (None if unavailable)
+        ndc: ndcproperties.json payload (None if unavailable)
+        
+    Returns:
+        Dictionary of the properties found (indications, mechanism, dosage)
+    """
+    properties = {}
+    if basic is not None:
+        properties.update(_extract_basic_info(basic))
+    
+    # Additional indications from RxClass
+    if classes is not None:
+        class_indications = _extract_indications(classes)
+        if class_indications:
+            if 'indications' in properties:
+                properties['indications'] += "\n\n" + class_indications
+            else:
+                properties['indications'] = class_indications
+    
+    # NDC properties for dosage
+    if ndc is not None:
+        properties['dosage'] = _extract_dosage(ndc)
+    return properties
+
+
+def _pubchem_urls(pubchem_base: str, drug_name: str) -> Tuple[str, str, str]:
+    """PubChem property, description and synonym URLs for a drug name."""
+    name_base = f"{pubchem_base}/compound/name/{drug_name}"
+    return (
+        f"{name_base}/property/MolecularFormula,MolecularWeight,IUPACName,CanonicalSMILES/JSON",
+        f"{name_base}/description/JSON",
+        f"{name_base}/synonyms/JSON"
+    )
+
+
+def _empty_pubchem_info() -> Dict:
+    """Default get_pubchem_info result when PubChem has no record."""
+    return {
+        "description": "Description not available",
+        "molecular_formula": "N/A",
+        "molecular_weight": "N/A",
+        "iupac_name": "N/A",
+        "smiles": None,
+        "synonyms": []
+    }
+
+
+def _pubchem_properties(data: Dict) -> Optional[Dict]:
+    """get_pubchem_info fields from a PubChem property/JSON payload, or None without a CID."""
+    properties = data.get("PropertyTable", {}).get("Properties", [{}])[0]
+    if not properties.get("CID"):
+        return None
+    return {
+        "molecular_formula": properties.get("MolecularFormula", "N/A"),
+        "molecular_weight": properties.get("MolecularWeight", "N/A"),
+        "iupac_name": properties.get("IUPACName", "N/A"),
+        "smiles": properties.get("CanonicalSMILES")
+    }
+
+
+def _pubchem_synonyms(data: Dict) -> List[str]:
+    """First 10 synonyms from a PubChem synonyms/JSON payload."""
+    return data.get("InformationList", {}).get("Information", [{}])[0].get("Synonym", [])[:10]
+
+
+def _empty_details(drug_name: str) -> Dict:
+    """Default get_drug_details result before any source has answered."""
+    return {
+        'name': drug_name,
+        'indications': _common_uses(drug_name),
+        'dosage': 'Information not available',
+        'adverse_effects': 'Information not available',
+        'mechanism': 'Information not available',
+        'safety_info': 'Information not available',
+        'interactions': 'Information not available',
+        'smiles': None
+    }
+
+
+def _assemble_details(
+    details: Dict,
+    properties: Optional[Dict],
+    classification: Optional[str],
+    effects: Optional[List[str]],
+    interactions: Optional[List[Dict[str, str]]],
+    pubchem_info: Optional[Dict],
+    smiles: Optional[str],
+    allow_ai: bool = True
+) -> Dict:
+    """
+    Merge fetched pieces into a get_drug_details result.
+    
+    RxCUI-dependent pieces are None when the drug wasn't found in RxNav.
+    With allow_ai=False missing fields are only filled from the static
+    knowledge base.
+    """
+    if properties is not None:
+        # Get drug properties
+        details.update(properties)
+        
+        # Get drug class
+        details['classification'] = classification
+        
+        # Get adverse effects
+        if effects and effects[0] != "Adverse effects information not available":
+            details['adverse_effects'] = _bullets(effects)
+        
+        # Get interactions
+        if interactions:
+            # Format interactions, filtering out empty descriptions
+            interaction_texts = []
+            for inter in interactions:
+                drug = inter.get('drug', '')
+                desc = inter.get('description', '').strip()
+                if desc:
+                    interaction_texts.append(f"- {drug}:\n  {desc}")
+                else:
+                    interaction_texts.append(f"- {drug}")
+            details['interactions'] = "\n".join(interaction_texts)
+    
+    # Get safety information
+    safety_info = []
+    if details.get('adverse_effects') not in _MISSING_EFFECTS:
+        safety_info.append(f"Adverse Effects:\n{details['adverse_effects']}")
+    if details.get('classification'):
+        safety_info.append(f"Drug Class:\n{details['classification']}")
+    if safety_info:
+        details['safety_info'] = "\n\n".join(safety_info)
+    else:
+        details['safety_info'] = "No detailed safety information available in database"
+    
+    # Get PubChem information
+    if pubchem_info:
+        details['mechanism'] = pubchem_info.get('description', 'Mechanism of action not available')
+        mol_info = []
+        if pubchem_info.get('molecular_formula'):
+            mol_info.append(f"Molecular Formula: {pubchem_info['molecular_formula']}")
+        if pubchem_info.get('molecular_weight'):
+            mol_info.append(f"Molecular Weight: {pubchem_info['molecular_weight']}")
+        if pubchem_info.get('iupac_name'):
+            mol_info.append(f"IUPAC Name: {pubchem_info['iupac_name']}")
+        details['molecular_info'] = "\n".join(mol_info)
+        
+        # Get SMILES for visualization
+        if smiles:
+            details['smiles'] = smiles
+    
+    # Use AI to fill in missing information
+    return _enhance_with_ai(details, drug_name=details['name'], allow_ai=allow_ai)
+
+
+def _enhance_with_ai(details: Dict, drug_name: str, allow_ai: bool = True) -> Dict:
+    """Use AI to fill in missing drug information, with fallback to static database."""
+    
+    # Check static knowledge base first
+    knowledge = _DRUG_KNOWLEDGE.get(drug_name.casefold())
+    if knowledge:
+        if details.get('dosage') in _MISSING_DOSAGE:
+            details['dosage'] = knowledge.get('dosage', details['dosage'])
+        if details.get('mechanism') in _MISSING_MECHANISM:
+            details['mechanism'] = knowledge.get('mechanism', details['mechanism'])
+        if details.get('smiles') in _MISSING_SMILES:
+            details['smiles'] = knowledge.get('smiles', details.get('smiles'))
+        return details
+    
+    if not allow_ai:
+        return details
+    
+    # Try AI enhancement for drugs not in static database
+    try:
+        from utils.api_client import get_api_client
+        
+        missing_fields = []
+        if details.get('dosage') in _MISSING_DOSAGE:
+            missing_fields.append('dosage')
+        if details.get('mechanism') in _MISSING_MECHANISM:
+            missing_fields.append('mechanism')
+        if details.get('smiles') in _MISSING_SMILES:
+            missing_fields.append('structure')
+        
+        if not missing_fields:
+            return details
+        
+        # Get AI-powered information
+        api_client = get_api_client()
+        
+        prompt = f"""Provide concise information for the drug "{drug_name}":
+"""
+        
+        if 'dosage' in missing_fields:
+            prompt += "\n1. DOSAGE: Typical adult dosage (2-3 sentences)"
+        if 'mechanism' in missing_fields:
+            prompt += "\n2. MECHANISM OF ACTION: How the drug works (2-3 sentences)"
+        if 'structure' in missing_fields:
+            prompt += "\n3. SMILES: SMILES notation for molecular structure (just the SMILES string)"
+        
+        prompt += "\n\nFormat your response as:\nDOSAGE: [info]\nMECHANISM: [info]\nSMILES: [notation]"
+        
+        response = api_client.chat_completion(
+            messages=[
+                {"role": "system", "content": "You are a pharmaceutical database assistant. Provide accurate, concise drug information."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=300
+        )
+        
+        content = response.choices[0].message.content
+        if content:
+            # Parse response
+            for key, value in _AI_RE.findall(content):
+                if key == 'DOSAGE' and 'dosage' in missing_fields:
+                    details['dosage'] = value
+                elif key == 'MECHANISM' and 'mechanism' in missing_fields:
+                    details['mechanism'] = value
+                elif key == 'SMILES' and 'structure' in missing_fields and value not in _MISSING_SMILES:
+                    details['smiles'] = value
+        
+        return details
+        
+    except Exception as e:
+        logger.error(f"Error enhancing with AI: {str(e)}")
+        return details
+
+
+def _pubchem_description(data: Dict) -> str:
+    """Get the first description text from a PubChem description/JSON payload."""
+    # The first entry usually carries only the compound title
+    for entry in data.get("InformationList", {}).get("Information", []):
+        if entry.get("Description"):
+            return entry["Description"]
+    return "Description not available"
+
+
+def _common_uses(drug_name: str) -> str:
+    """Return common uses for a small set of well-known drugs as a fallback."""
+    return _COMMON_USES.get(drug_name.strip().lower(), "Information not available")
+
+
+def _empty_comprehensive_info(drug_name: str) -> Dict:
+    """Default get_comprehensive_drug_info result before any source has answered."""
+    return {
+        "drug_name": drug_name.title(),
+        "status": "success",
+        "rxcui": None,
+        "drug_class": "Not available",
+        "mechanism_of_action": "Not available",
+        "uses": "Not available",
+        "adverse_effects": [],
+        "drug_interactions": [],
+        "food_interactions": "Avoid alcohol unless specifically advised by healthcare provider",
+        "molecular_info": {},
+        "error": None
+    }
+
+
+def _finish_comprehensive_info(
+    result: Dict,
+    drug_name: str,
+    pubchem_info: Optional[Dict],
+    unreachable: bool
+) -> None:
+    """Fill the PubChem-derived fields and final status of a get_comprehensive_drug_info result."""
+    pubchem_info = pubchem_info or {}
+    result["molecular_info"] = pubchem_info
+    # Use PubChem description when available; otherwise fall back to
+    # a small built-in mapping of common uses for popular drugs.
+    pubchem_description = (pubchem_info.get("description") or "").strip()
+    if pubchem_description and pubchem_description.lower() != "description not available":
+        result["uses"] = pubchem_description
+    else:
+        result["uses"] = _common_uses(drug_name)
+    
+    if unreachable and result["status"] == "success":
+        result["status"] = "partial"
+        result["error"] = "Some data sources are not responding; showing what was available"
+
+
 class DrugInfoFetcher:
     """Fetches drug information from RxNav and PubChem APIs."""
     
@@ -21,13 +994,13 @@ class DrugInfoFetcher:
         self.pubchem_base = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
         self.fda_base = "https://api.fda.gov/drug"
         
-        # Initialize session with custom user agent
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'PharmaGenieAI/1.0 (Educational Project)'
-        })
+        # Pooled keep-alive connections are shared by every fetcher instance
+        self.session = _get_shared_session()
+        
+        # Shared cache across workers (only when REDIS_URL is configured)
+        self._redis = _get_redis_client()
         
-    @lru_cache(maxsize=100)
+    @_ttl_cached(maxsize=512, is_miss=_no_rxcui)
     def get_rxcui(self, drug_name: str) -> Optional[str]:
         """
         Get RxCUI (unique drug identifier) from RxNav.
@@ -36,25 +1009,28 @@ class DrugInfoFetcher:
             drug_name: Name of the drug
             
         Returns:
-            RxCUI string or None if not found
+            RxCUI string or None if not found (or RxNav is unreachable)
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
         try:
             url = f"{self.rxnav_base}/rxcui.json"
             params = {'name': drug_name}
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            rxcui_list = data.get("idGroup", {}).get("rxnormId", [])
+            response = self._session_get(url, params=params, timeout=10)
+            _check_status(response)
             
-            if rxcui_list:
-                return rxcui_list[0]
-            return None
+            return _parse_rxcui(_json_body(response))
             
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching RxCUI for {drug_name}: {str(e)}")
             return None
+        except _TRANSIENT_ERRORS as e:
+            logger.warning(f"RxNav unreachable while fetching RxCUI for {drug_name}: {str(e)}")
+            return _Incomplete(None)
     
+    @_ttl_cached(stale_grace=STALE_GRACE_SECONDS)
     def get_drug_class(self, rxcui: str) -> str:
         """
         Get drug class/category from RxNav.
@@ -64,6 +1040,10 @@ class DrugInfoFetcher:
             
         Returns:
             Drug class string
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
         try:
             url = f"{self.rxnav_base}/rxclass/class/byRxcui.json"
@@ -71,433 +1051,458 @@ class DrugInfoFetcher:
                 'rxcui': rxcui,
                 'relaSource': 'ATC'  # Anatomical Therapeutic Chemical Classification
             }
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            data, complete = self._attempt("RxNav", self._get, url, params)
             
-            data = response.json()
-            class_list = data.get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", [])
+            # Top 3 classes
+            return _parse_drug_class(data) or _result("Classification not available", complete)
             
-            if class_list:
-                classes = [item.get("rxclassMinConceptItem", {}).get("className", "") 
-                          for item in class_list]
-                return ", ".join(filter(None, classes[:3]))  # Return top 3 classes
-            
-            return "Classification not available"
-            
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching drug class for RxCUI {rxcui}: {str(e)}")
             return "Classification not available"
     
-    def _get_common_drug_interactions(self, drug_name: str) -> List[Dict[str, str]]:
+    def _fetch(self, getter: Callable, *args) -> Tuple[Any, bool]:
+        """Call a _ttl_cached getter, also returning whether every source it needed answered."""
+        return getter.with_status(self, *args)
+    
+    def _attempt(self, source: str, call: Callable, *args) -> Tuple[Any, bool]:
+        """Run one source lookup; an unreachable source gives (None, False) instead of raising."""
+        try:
+            return call(*args), True
+        except _TRANSIENT_ERRORS as e:
+            logger.warning(f"{source} unreachable: {str(e)}")
+            return None, False
+    
+    def _session_get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session, within the process-wide request budget."""
+        # Only leaf HTTP calls take slots, so nested executor fan-out can't deadlock on them
+        with _GLOBAL_REQUEST_SLOTS:
+            return self.session.get(url, **kwargs)
+    
+    def _read_shared(self, key: str) -> Tuple[bool, Any]:
+        """Look a result up in Redis (if configured) or the on-disk cache."""
+        if self._redis is not None:
+            try:
+                hit = self._redis.get(key)
+                if hit is not None:
+                    return True, json.loads(hit)
+            except redis.RedisError as e:
+                logger.warning(f"Redis lookup failed for {key}: {str(e)}")
+            return False, None
+        
+        try:
+            entry = get_cached_data(_disk_key(key))
+        except _DISK_ERRORS as e:
+            logger.warning(f"Disk cache lookup failed for {key}: {str(e)}")
+            return False, None
+        return (True, entry["value"]) if entry is not None else (False, None)
+    
+    def _write_shared(self, key: str, value: Any, ttl: int) -> None:
+        """Store a result in Redis (if configured) or the on-disk cache."""
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, ttl, json.dumps(value))
+            except redis.RedisError as e:
+                logger.warning(f"Redis write failed for {key}: {str(e)}")
+            return
+        
+        try:
+            # Wrapped so a cached None (e.g. no RxCUI) is told apart from a miss
+            cache_data(_disk_key(key), {"value": value}, ttl=ttl)
+        except _DISK_ERRORS as e:
+            logger.warning(f"Disk cache write failed for {key}: {str(e)}")
+    
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
         """
-        Get common drug interactions from built-in database for well-known drugs.
-        Fallback when API sources are unavailable.
+        GET a URL and return its JSON body, or None on a non-200 response.
+        
+        Bodies served with an ETag are remembered (in memory and in the
+        on-disk cache, so they survive restarts), and the next request for
+        the same URL sends If-None-Match so an unchanged resource comes back
+        as an empty 304 and the remembered body is reused.
         
         Args:
-            drug_name: Name of the drug (case-insensitive)
+            url: Request URL
+            params: Query parameters
             
         Returns:
-            List of common drug interactions
-        """
-        # Common drug interactions database
-        common_interactions = {
-            "aspirin": [
-                {"drug": "Warfarin", "description": "Increased risk of bleeding. Aspirin enhances the anticoagulant effect of warfarin, which may lead to serious bleeding complications."},
-                {"drug": "Ibuprofen", "description": "Reduced cardiovascular protection. Ibuprofen may interfere with aspirin's antiplatelet effects when taken regularly."},
-                {"drug": "Naproxen", "description": "Increased risk of gastrointestinal bleeding and ulcers when NSAIDs are combined."},
-                {"drug": "Clopidogrel", "description": "Significantly increased bleeding risk. Both drugs affect platelet function, leading to enhanced antiplatelet effects."},
-                {"drug": "Methotrexate", "description": "Aspirin may increase methotrexate toxicity by reducing its renal clearance."},
-                {"drug": "ACE Inhibitors", "description": "Aspirin may reduce the effectiveness of ACE inhibitors in treating hypertension and heart failure."},
-            ],
-            "ibuprofen": [
-                {"drug": "Aspirin", "description": "Reduced cardiovascular protection from aspirin. Ibuprofen may interfere with aspirin's antiplatelet effects."},
-                {"drug": "Warfarin", "description": "Increased risk of bleeding due to antiplatelet effects and GI irritation."},
-                {"drug": "Lithium", "description": "Ibuprofen may increase lithium blood levels, potentially leading to toxicity."},
-                {"drug": "Methotrexate", "description": "Reduced renal clearance of methotrexate may lead to increased toxicity."},
-                {"drug": "ACE Inhibitors", "description": "May reduce the antihypertensive effect and increase risk of kidney problems."},
-            ],
-            "metformin": [
-                {"drug": "Contrast Dye", "description": "Increased risk of lactic acidosis. Metformin should be temporarily discontinued before and after procedures using iodinated contrast."},
-                {"drug": "Alcohol", "description": "Increased risk of lactic acidosis and may enhance blood glucose-lowering effect."},
-                {"drug": "Cimetidine", "description": "May increase metformin blood levels by reducing kidney clearance."},
-                {"drug": "Furosemide", "description": "May increase metformin levels and decrease furosemide levels through renal effects."},
-            ],
-            "warfarin": [
-                {"drug": "Aspirin", "description": "Significantly increased bleeding risk. Both drugs affect blood clotting through different mechanisms."},
-                {"drug": "NSAIDs", "description": "Increased risk of bleeding and gastric ulceration."},
-                {"drug": "Antibiotics", "description": "Many antibiotics can enhance warfarin's effect by reducing vitamin K production."},
-                {"drug": "Amiodarone", "description": "Significantly increases warfarin effect, requiring dose reduction and close INR monitoring."},
-                {"drug": "Acetaminophen", "description": "Regular use may increase INR, though occasional use is generally safe."},
-            ],
-            "lisinopril": [
-                {"drug": "NSAIDs", "description": "May reduce the antihypertensive effect and increase risk of kidney dysfunction."},
-                {"drug": "Potassium Supplements", "description": "Increased risk of hyperkalemia (high potassium levels)."},
-                {"drug": "Lithium", "description": "May increase lithium levels, potentially causing toxicity."},
-                {"drug": "Diuretics", "description": "May cause excessive blood pressure lowering, especially with first dose."},
-            ],
-            "atorvastatin": [
-                {"drug": "Grapefruit Juice", "description": "May significantly increase atorvastatin levels, raising the risk of side effects including muscle damage."},
-                {"drug": "Clarithromycin", "description": "May increase statin levels and risk of muscle toxicity (rhabdomyolysis)."},
-                {"drug": "Diltiazem", "description": "May increase atorvastatin levels, potentially requiring dose adjustment."},
-                {"drug": "Gemfibrozil", "description": "Increased risk of muscle toxicity when combined with statins."},
-            ],
-            "omeprazole": [
-                {"drug": "Clopidogrel", "description": "May reduce the effectiveness of clopidogrel by inhibiting its activation."},
-                {"drug": "Warfarin", "description": "May increase warfarin levels, requiring closer INR monitoring."},
-                {"drug": "Methotrexate", "description": "May increase methotrexate levels, especially at high doses."},
-            ],
-            "amoxicillin": [
-                {"drug": "Oral Contraceptives", "description": "May reduce the effectiveness of birth control pills."},
-                {"drug": "Warfarin", "description": "May enhance warfarin's effect, increasing bleeding risk."},
-                {"drug": "Methotrexate", "description": "May reduce methotrexate clearance, increasing toxicity risk."},
-            ],
-            "paracetamol": [
-                {"drug": "Warfarin", "description": "Regular use (4+ days) may increase INR and bleeding risk."},
-                {"drug": "Alcohol", "description": "Chronic alcohol use increases risk of liver damage from acetaminophen."},
-                {"drug": "Carbamazepine", "description": "May increase metabolism of acetaminophen, reducing effectiveness and increasing toxic metabolite formation."},
-            ],
-            "acetaminophen": [
-                {"drug": "Warfarin", "description": "Regular use (4+ days) may increase INR and bleeding risk."},
-                {"drug": "Alcohol", "description": "Chronic alcohol use increases risk of liver damage from acetaminophen."},
-                {"drug": "Isoniazid", "description": "May increase risk of liver toxicity from acetaminophen."},
-            ]
-        }
+            Parsed JSON body or None
+            
+        Raises:
+            TransientFetchError: If the source kept answering with a retryable status
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        disk_key = _disk_key(f"drug:etag:{key!r}")
+        with _ETAGS_LOCK:
+            entry = _ETAGS.get(key)
+        if entry is None:
+            try:
+                stored = get_cached_data(disk_key)
+            except _DISK_ERRORS as e:
+                logger.warning(f"Disk cache lookup failed for ETag of {url}: {str(e)}")
+                stored = None
+            if stored is not None:
+                entry = (stored["etag"], stored["data"])
+                with _ETAGS_LOCK:
+                    _ETAGS[key] = entry
+        headers = {'If-None-Match': entry[0]} if entry else None
         
-        # Normalize drug name for lookup
-        drug_lookup = drug_name.lower().strip()
+        response = self._session_get(url, params=params, headers=headers, timeout=10)
+        if response.status_code == 304 and entry:
+            return entry[1]
+        if response.status_code in RETRY_STATUSES:
+            raise TransientFetchError(f"{response.status_code} from {url}")
+        if response.status_code != 200:
+            return None
         
-        # Check if we have interactions for this drug
-        if drug_lookup in common_interactions:
-            return common_interactions[drug_lookup]
+        data = _json_body(response)
+        etag = response.headers.get('ETag')
+        if etag:
+            with _ETAGS_LOCK:
+                _ETAGS[key] = (etag, data)
+            try:
+                cache_data(disk_key, {"etag": etag, "data": data}, ttl=ETAG_TTL_SECONDS)
+            except _DISK_ERRORS as e:
+                logger.warning(f"Disk cache write failed for ETag of {url}: {str(e)}")
+        return data
+    
+    def _fda_label(self, drug_name: str) -> Dict:
+        """
+        Get the openFDA label record for a drug.
         
-        return []
+        Labels already loaded by fetch_many are reused instead of
+        issuing another request.
+        
+        Args:
+            drug_name: Name of the drug
+            
+        Returns:
+            Label record dictionary, or {} if FDA has no label for it
+        """
+        key = drug_name.casefold()
+        with _FDA_LABELS_LOCK:
+            label = _FDA_LABELS.get(key)
+        if label is not None:
+            return label
+        
+        response = self._session_get(f"{self.fda_base}/label.json", params=_fda_label_params(drug_name), timeout=10)
+        # openFDA answers 404 when nothing matches, which is a valid "no label"
+        if response.status_code in RETRY_STATUSES:
+            raise TransientFetchError(f"{response.status_code} from openFDA")
+        if response.status_code not in (200, 404):
+            return {}
+        
+        results = _json_body(response).get('results') if response.status_code == 200 else None
+        label = results[0] if results else {}
+        with _FDA_LABELS_LOCK:
+            _FDA_LABELS[key] = label
+        return label
     
-    def get_drug_interactions(self, drug_name: str) -> List[Dict[str, str]]:
+    def fetch_many(self, drug_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get openFDA label records for several drugs in as few requests as possible.
+        
+        Up to FDA_BATCH_SIZE names are OR'd into one label.json search, asking
+        for FDA_LABELS_PER_DRUG records per name, and the results are matched
+        back by generic/brand name. Labels are cached, so
+        the interaction, adverse effect and use lookups for these drugs don't
+        go back to FDA afterwards.
+        
+        Args:
+            drug_names: Names of the drugs
+            
+        Returns:
+            Dictionary mapping each drug name to its label record ({} if none)
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
+        """
+        with _FDA_LABELS_LOCK:
+            labels = {name.casefold(): _FDA_LABELS.get(name.casefold()) for name in drug_names}
+        missing = [key for key, label in labels.items() if label is None]
+        
+        for start in range(0, len(missing), FDA_BATCH_SIZE):
+            batch = missing[start:start + FDA_BATCH_SIZE]
+            try:
+                response = self._session_get(f"{self.fda_base}/label.json", params={
+                    'search': _fda_search(batch),
+                    'limit': len(batch) * FDA_LABELS_PER_DRUG
+                }, timeout=10)
+                if response.status_code not in (200, 404):
+                    logger.warning(f"FDA batch lookup returned {response.status_code} for {len(batch)} drugs")
+                    continue
+                results = _json_body(response).get('results', []) if response.status_code == 200 else []
+            except _TRANSIENT_ERRORS + _PERMANENT_ERRORS as e:
+                logger.warning(f"Error fetching FDA labels for {len(batch)} drugs: {str(e)}")
+                continue
+            
+            # Fan results back out; an exact name match beats a phrase match
+            # (e.g. "aspirin" in "ASPIRIN AND CAFFEINE")
+            found: Dict[str, Dict] = {}
+            for result in results:
+                for name in _label_names(result):
+                    if name in labels and name not in found:
+                        found[name] = result
+            for key in batch:
+                if key not in found:
+                    found[key] = next(
+                        (result for result in results if any(key in name for name in _label_names(result))),
+                        {}
+                    )
+            
+            with _FDA_LABELS_LOCK:
+                for key in batch:
+                    labels[key] = _FDA_LABELS[key] = found[key]
+        
+        return {name: labels[name.casefold()] or {} for name in drug_names}
+    
+    @_ttl_cached()
+    def get_drug_interactions(self, drug_name: str, rxcui: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Get drug-drug interactions from multiple sources.
         
         Args:
             drug_name: Name of the drug
+            rxcui: Already-resolved RxCUI (looked up from drug_name if omitted)
             
         Returns:
             List of dictionaries containing interacting drug information
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
         interactions: List[Dict[str, str]] = []
         
         # First get RxCUI
-        try:
-            rxcui = self.get_rxcui(drug_name)
-            if not rxcui:
-                # Try common interactions database as fallback
-                common_interactions = self._get_common_drug_interactions(drug_name)
-                if common_interactions:
-                    return common_interactions
-                return [{"drug": "Could not find drug in database", "description": ""}]
-        except Exception as e:
-            logger.error(f"Error getting RxCUI for {drug_name}: {str(e)}")
+        rxcui, complete = (rxcui, True) if rxcui else self._fetch(self.get_rxcui, drug_name)
+        if not rxcui:
             # Try common interactions database as fallback
-            common_interactions = self._get_common_drug_interactions(drug_name)
+            common_interactions = _common_drug_interactions(drug_name)
             if common_interactions:
-                return common_interactions
-            return [{"drug": "Error fetching drug information", "description": ""}]
+                return _result(common_interactions, complete)
+            if not complete:
+                return _Incomplete([{"drug": "Error fetching drug information", "description": ""}])
+            return [{"drug": "Could not find drug in database", "description": ""}]
             
         # Try RxNav's interaction API (using the list endpoint which is more reliable)
         try:
             # Use the findInteractionsFromList endpoint with just this drug
             url = f"{self.rxnav_base}/interaction/list.json"
-            params = {'rxcuis': rxcui}
-            response = self.session.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                full_interaction_list = data.get("fullInteractionTypeGroup", [])
-                
-                for group in full_interaction_list:
-                    source_name = group.get("sourceName", "")
-                    for interaction_type in group.get("fullInteractionType", []):
-                        for pair in interaction_type.get("interactionPair", []):
-                            try:
-                                # Get the other drug in the interaction
-                                concepts = pair.get("interactionConcept", [])
-                                if len(concepts) >= 2:
-                                    # The second concept is usually the interacting drug
-                                    other_drug = concepts[1].get("minConceptItem", {}).get("name", "")
-                                    desc = pair.get("description", "").strip()
-                                    
-                                    if other_drug and desc:
-                                        interactions.append({
-                                            "drug": other_drug,
-                                            "description": f"{desc} (Source: {source_name})"
-                                        })
-                            except (KeyError, IndexError, TypeError) as e:
-                                logger.debug(f"Skipping malformed interaction pair: {e}")
-                                continue
-        except Exception as e:
+            data, reached = self._attempt("RxNav", self._get, url, {'rxcuis': rxcui})
+            complete = complete and reached
+            if data is not None:
+                interactions.extend(_parse_rxnav_interactions(data))
+        except _PERMANENT_ERRORS as e:
             logger.warning(f"Error fetching RxNav interactions for {drug_name}: {str(e)}")
             
         # If no interactions found in RxNav, try FDA API
         if not interactions:
             try:
-                fda_url = f"{self.fda_base}/drug/label.json"
-                params = {
-                    'search': f'openfda.generic_name:"{drug_name}" OR openfda.brand_name:"{drug_name}"',
-                    'limit': 1
-                }
-                response = self.session.get(fda_url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('results'):
-                        result = data['results'][0]
-                        
-                        if result.get('drug_interactions'):
-                            for interaction in result['drug_interactions']:
-                                interactions.append({
-                                    "drug": "FDA Interaction Warning",
-                                    "description": interaction.strip()
-                                })
-            except Exception as e:
+                label, reached = self._attempt("openFDA", self._fda_label, drug_name)
+                complete = complete and reached
+                interactions.extend(_fda_interactions(label or {}))
+            except _PERMANENT_ERRORS as e:
                 logger.warning(f"Error fetching FDA interactions for {drug_name}: {str(e)}")
         
-        # If we have interactions, deduplicate and limit to top 10
-        if interactions:
-            unique_interactions: List[Dict[str, str]] = []
-            seen = set()
-            for item in interactions:
-                if item["drug"] not in seen:
-                    seen.add(item["drug"])
-                    unique_interactions.append(item)
-                if len(unique_interactions) >= 10:
-                    break
-            return unique_interactions
-            
-        # Try common interactions database as final fallback
-        common_interactions = self._get_common_drug_interactions(drug_name)
-        if common_interactions:
-            return common_interactions
-            
-        # No interactions found from any source
-        return [{"drug": "No major interactions found", "description": "This drug has no major known interactions in the database. Always consult your healthcare provider before combining medications."}]
+        return _result(_finalize_interactions(drug_name, interactions), complete)
     
-    def get_drug_properties(self, rxcui: str) -> Dict:
-        """Get comprehensive drug properties from RxNav"""
+    def get_drug_interactions_many(self, rxcuis: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get RxNav interactions among several drugs with one interaction/list.json call.
+        
+        Each interaction pair is attributed to both of its drugs, so the
+        result holds, per RxCUI, the other listed drugs it interacts with.
+        Unlike get_drug_interactions there is no FDA or built-in fallback.
+        
+        Args:
+            rxcuis: RxCUIs of the drugs
+            
+        Returns:
+            Dictionary mapping each RxCUI to its interactions ([] if none,
+            or for every RxCUI when RxNav is unreachable)
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
+        """
+        if not rxcuis:
+            return {}
+        # Cached per set of drugs, whatever order they were picked in
+        return self._interactions_among(tuple(sorted(set(rxcuis))))
+    
+    @_ttl_cached()
+    def _interactions_among(self, rxcuis: Tuple[str, ...]) -> Dict[str, List[Dict[str, str]]]:
+        """Uncached get_drug_interactions_many for a sorted tuple of distinct RxCUIs."""
+        results: Dict[str, List[Dict[str, str]]] = {rxcui: [] for rxcui in rxcuis}
+        
         try:
-            properties = {}
+            url = f"{self.rxnav_base}/interaction/list.json"
+            data, complete = self._attempt("RxNav", self._get, url, {'rxcuis': ' '.join(rxcuis)})
+        except _PERMANENT_ERRORS as e:
+            logger.warning(f"Error fetching RxNav interactions for {len(rxcuis)} drugs: {str(e)}")
+            return results
+        
+        for group in (data or {}).get("fullInteractionTypeGroup", []):
+            source_name = group.get("sourceName", "")
+            for interaction_type in group.get("fullInteractionType", []):
+                for pair in interaction_type.get("interactionPair", []):
+                    concepts = [concept.get("minConceptItem", {}) for concept in pair.get("interactionConcept", [])]
+                    desc = pair.get("description", "").strip()
+                    if len(concepts) < 2 or not desc:
+                        continue
+                    # Fan the pair out to whichever side(s) were requested
+                    for this, other in ((concepts[0], concepts[1]), (concepts[1], concepts[0])):
+                        if this.get("rxcui") in results and other.get("name"):
+                            results[this["rxcui"]].append({
+                                "drug": other["name"],
+                                "description": f"{desc} (Source: {source_name})"
+                            })
+        return _result(results, complete)
+    
+    @_ttl_cached(stale_grace=STALE_GRACE_SECONDS)
+    def get_drug_properties(self, rxcui: str) -> Dict:
+        """
+        Get comprehensive drug properties from RxNav.
+        
+        Args:
+            rxcui: RxNorm Concept Unique Identifier
+            
+        Returns:
+            Dictionary of the properties found (indications, mechanism, dosage)
             
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
+        """
+        try:
             # Get basic drug info including indications
             url = f"{self.rxnav_base}/rxcui/{rxcui}/allProperties.json"
-            response = self.session.get(url, params={'prop': 'attributes'}, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                properties.update(self._extract_basic_info(data))
+            basic, complete = self._attempt("RxNav", self._get, url, {'prop': 'attributes'})
             
             # Get additional indications from RxClass
             url = f"{self.rxnav_base}/rxclass/class/byRxcui.json"
-            params = {'rxcui': rxcui}
-            response = self.session.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                class_indications = self._extract_indications(data)
-                if class_indications:
-                    if 'indications' in properties:
-                        properties['indications'] += "\n\n" + class_indications
-                    else:
-                        properties['indications'] = class_indications
+            classes, reached = self._attempt("RxNav", self._get, url, {'rxcui': rxcui})
+            complete = complete and reached
             
             # Get NDC properties for dosage
             url = f"{self.rxnav_base}/ndcproperties.json"
-            params = {'id': rxcui}
-            response = self.session.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                ndc_data = response.json()
-                properties['dosage'] = self._extract_dosage(ndc_data)
-                
-            return properties
+            ndc, reached = self._attempt("RxNav", self._get, url, {'id': rxcui})
+            complete = complete and reached
             
-        except Exception as e:
-            logger.error(f"Error fetching drug properties for RxCUI {rxcui}: {str(e)}")
-            return {}
+            return _result(_build_properties(basic, classes, ndc), complete)
             
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching drug properties for RxCUI {rxcui}: {str(e)}")
             return {}
             
-    def _extract_basic_info(self, data: Dict) -> Dict:
-        """Extract basic drug information from RxNav allProperties endpoint"""
-        info = {}
-        try:
-            properties = data.get("propConceptGroup", {}).get("propConcept", [])
-            
-            # Collect all indications and uses
-            indications = []
-            mechanism = []
-            
-            for prop in properties:
-                prop_name = prop.get("propName", "").lower()
-                prop_value = prop.get("propValue", "")
-                
-                if any(word in prop_name for word in ["indication", "use", "treat"]):
-                    indications.append(f"- {prop_value}")
-                elif any(word in prop_name for word in ["mechanism", "action", "activity"]):
-                    mechanism.append(f"- {prop_value}")
-                    
-            if indications:
-                info["indications"] = "\n".join(indications)
-            if mechanism:
-                info["mechanism"] = "\n".join(mechanism)
-                
-            return info
-            
-        except Exception as e:
-            logger.error(f"Error extracting basic info: {str(e)}")
-            return {}
-            
-    def _extract_indications(self, data: Dict) -> str:
-        """Extract indications from RxClass data"""
-        try:
-            indications = []
-            
-            # Extract from rxclassDrugInfoList
-            drug_info_list = data.get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", [])
-            for item in drug_info_list:
-                class_info = item.get("rxclassMinConceptItem", {})
-                if class_info.get("classType") == "INDICATION":
-                    indications.append(f"- {class_info.get('className', '')}")
-                    
-            # Extract from rxclassMinConceptList as backup
-            if not indications:
-                class_info = data.get("rxclassMinConceptList", {}).get("rxclassMinConcept", [])
-                for item in class_info:
-                    if item.get("classType") == "INDICATION":
-                        indications.append(f"- {item.get('className', '')}")
-                        
-            return "\n".join(indications) if indications else ""
-        except Exception:
-            return ""
-            
-    def _extract_dosage(self, data: Dict) -> str:
-        """Extract dosage information from NDC properties"""
-        try:
-            props = data.get("ndcPropertyList", {}).get("ndcProperty", [])
-            dosage_info = []
-            for prop in props:
-                if "dosage" in prop.get("propertyName", "").lower():
-                    dosage_info.append(f"{prop['propertyName']}: {prop['propertyValue']}")
-            return "\n".join(dosage_info) if dosage_info else "Dosage information not available"
-        except Exception:
-            return "Dosage information not available"
-            
-    def get_adverse_effects(self, drug_name: str) -> List[str]:
+    @_ttl_cached()
+    def get_adverse_effects(self, drug_name: str, rxcui: Optional[str] = None) -> List[str]:
         """
         Get adverse effects from RxNav and FDA sources.
         
         Args:
             drug_name: Name of the drug to get adverse effects for
+            rxcui: Already-resolved RxCUI (looked up from drug_name if omitted)
             
         Returns:
             List of adverse effects as strings
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
         try:
             # First get RxCUI if not already provided
-            rxcui = self.get_rxcui(drug_name)
+            rxcui, complete = (rxcui, True) if rxcui else self._fetch(self.get_rxcui, drug_name)
             if not rxcui:
+                if not complete:
+                    return _Incomplete(["Adverse effects information not available"])
                 return ["Could not find drug in database"]
             
             # Try RxNav's MED-RT API for adverse effects
             url = f"{self.rxnav_base}/rxclass/class/byRxcui.json"
-            params = {'rxcui': rxcui, 'relaSource': 'MEDRT', 'relas': 'has_PE'}
-            response = self.session.get(url, params=params, timeout=10)
-            
-            effects: List[str] = []
+            data, complete = self._attempt(
+                "RxNav", self._get, url, {'rxcui': rxcui, 'relaSource': 'MEDRT', 'relas': 'has_PE'}
+            )
             
-            if response.status_code == 200:
-                data = response.json()
-                for item in data.get("rxclassDrugInfoList", {}).get("rxclassDrugInfo", []):
-                    effect = item.get("rxclassMinConceptItem", {}).get("className", "")
-                    if effect and effect not in effects:
-                        effects.append(effect)
+            effects = _parse_adverse_effects(data) if data is not None else []
             
             # If no effects found in RxNav, try FDA API
             if not effects:
                 try:
-                    fda_url = f"{self.fda_base}/label.json"
-                    params = {
-                        'search': f'openfda.generic_name:"{drug_name}" OR openfda.brand_name:"{drug_name}"',
-                        'limit': 1
-                    }
-                    response = self.session.get(fda_url, params=params, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get('results'):
-                            result = data['results'][0]
-                            if result.get('adverse_reactions'):
-                                effects.extend(result['adverse_reactions'])
-                except Exception as e:
+                    label, reached = self._attempt("openFDA", self._fda_label, drug_name)
+                    complete = complete and reached
+                    effects.extend((label or {}).get('adverse_reactions') or [])
+                except _PERMANENT_ERRORS as e:
                     logger.warning(f"Error fetching FDA adverse effects for {drug_name}: {str(e)}")
             
-            return effects if effects else ["No major adverse effects reported"]
+            if effects:
+                return _result(effects, complete)
+            if not complete:
+                return _Incomplete(["Adverse effects information not available"])
+            return ["No major adverse effects reported"]
             
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching adverse effects for {drug_name}: {str(e)}")
             return ["Adverse effects information not available"]
             
-    def get_drug_uses(self, drug_name: str) -> str:
+    @_ttl_cached()
+    def get_drug_uses(self, drug_name: str, rxcui: Optional[str] = None) -> str:
         """
         Get drug uses and indications from multiple sources.
         
         Args:
             drug_name: Name of the drug to get uses for
+            rxcui: Already-resolved RxCUI (looked up from drug_name if omitted)
             
         Returns:
             String containing drug uses and indications
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
         try:
             # Try FDA API first
-            fda_url = f"{self.fda_base}/label.json"
-            params = {
-                'search': f'openfda.generic_name:"{drug_name}" OR openfda.brand_name:"{drug_name}"',
-                'limit': 1
-            }
-            response = self.session.get(fda_url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('results'):
-                    uses = []
-                    result = data['results'][0]
+            result, complete = self._attempt("openFDA", self._fda_label, drug_name)
+            if result:
+                uses = []
+                
+                # Get indications
+                if result.get('indications_and_usage'):
+                    uses.extend([use.strip() for use in result['indications_and_usage']])
                     
-                    # Get indications
-                    if result.get('indications_and_usage'):
-                        uses.extend([f"- {use.strip()}" for use in result['indications_and_usage']])
-                        
-                    # Get purpose/use
-                    if result.get('purpose'):
-                        uses.extend([f"- {purpose.strip()}" for purpose in result['purpose']])
-                        
-                    if uses:
-                        return "\n".join(uses)
+                # Get purpose/use
+                if result.get('purpose'):
+                    uses.extend([purpose.strip() for purpose in result['purpose']])
+                    
+                if uses:
+                    return _bullets(uses)
             
             # Fallback to RxNav
-            rxcui = self.get_rxcui(drug_name)
+            if not rxcui:
+                rxcui, reached = self._fetch(self.get_rxcui, drug_name)
+                complete = complete and reached
             if rxcui:
                 url = f"{self.rxnav_base}/rxclass/class/byRxcui.json"
-                params = {'rxcui': rxcui}
-                response = self.session.get(url, params=params, timeout=10)
+                data, reached = self._attempt("RxNav", self._get, url, {'rxcui': rxcui})
+                complete = complete and reached
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if data is not None:
                     uses = []
                     for item in data.get('rxclassDrugInfoList', {}).get('rxclassDrugInfo', []):
                         class_info = item.get('rxclassMinConceptItem', {})
                         if class_info.get('classType') == 'INDICATION':
-                            uses.append(f"- {class_info.get('className', '')}")
+                            uses.append(class_info.get('className', ''))
                     if uses:
-                        return "\n".join(uses)
+                        return _result(_bullets(uses), complete)
             
+            if not complete:
+                return _Incomplete("Error fetching indication information")
             return "No indication information available"
             
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching drug uses for {drug_name}: {str(e)}")
             return "Error fetching indication information"
 
@@ -511,230 +1516,82 @@ class DrugInfoFetcher:
         Returns:
             Dictionary containing comprehensive drug information
         """
-        details = {
-            'name': drug_name,
-            'indications': self._get_drug_uses(drug_name),
-            'dosage': 'Information not available',
-            'adverse_effects': 'Information not available',
-            'mechanism': 'Information not available',
-            'safety_info': 'Information not available',
-            'interactions': 'Information not available',
-            'smiles': None
-        }
+        details = _empty_details(drug_name)
         
         try:
-            # Get RxCUI
-            rxcui = self.get_rxcui(drug_name)
-            if rxcui:
-                # Get drug properties
-                properties = self.get_drug_properties(rxcui)
-                details.update(properties)
-                
-                # Get drug class
-                details['classification'] = self.get_drug_class(rxcui)
-                
-                # Get adverse effects
-                effects = self.get_adverse_effects(rxcui)
-                if effects and effects[0] != "Adverse effects information not available":
-                    details['adverse_effects'] = "\n".join(f"- {effect}" for effect in effects)
-                
-                # Get interactions
-                interactions = self.get_drug_interactions(drug_name)
-                if interactions:
-                    # Format interactions, filtering out empty descriptions
-                    interaction_texts = []
-                    for inter in interactions:
-                        drug = inter.get('drug', '')
-                        desc = inter.get('description', '').strip()
-                        if desc:
-                            interaction_texts.append(f"- {drug}:\n  {desc}")
-                        else:
-                            interaction_texts.append(f"- {drug}")
-                    details['interactions'] = "\n".join(interaction_texts)
-            
-            # Get safety information
-            safety_info = []
-            if details.get('adverse_effects') and details['adverse_effects'] != 'Information not available':
-                safety_info.append(f"Adverse Effects:\n{details['adverse_effects']}")
-            if details.get('classification'):
-                safety_info.append(f"Drug Class:\n{details['classification']}")
-            if safety_info:
-                details['safety_info'] = "\n\n".join(safety_info)
-            else:
-                details['safety_info'] = "No detailed safety information available in database"
+            # PubChem lookup doesn't depend on the RxCUI, so start it right away
+            pubchem_future = _FANOUT_EXECUTOR.submit(self._fetch, self.get_pubchem_info, drug_name)
             
-            # Get PubChem information
-            pubchem_info = self.get_pubchem_info(drug_name)
-            if pubchem_info:
-                details['mechanism'] = pubchem_info.get('description', 'Mechanism of action not available')
-                mol_info = []
-                if pubchem_info.get('molecular_formula'):
-                    mol_info.append(f"Molecular Formula: {pubchem_info['molecular_formula']}")
-                if pubchem_info.get('molecular_weight'):
-                    mol_info.append(f"Molecular Weight: {pubchem_info['molecular_weight']}")
-                if pubchem_info.get('iupac_name'):
-                    mol_info.append(f"IUPAC Name: {pubchem_info['iupac_name']}")
-                details['molecular_info'] = "\n".join(mol_info)
-                
-                # Get SMILES for visualization
-                smiles = self.get_smiles(drug_name)
-                if smiles:
-                    details['smiles'] = smiles
+            properties = classification = effects = interactions = None
             
-            # Use AI to fill in missing information
-            details = self._enhance_with_ai(details, drug_name)
-            
-            return details
+            # Get RxCUI
+            rxcui, complete = self._fetch(self.get_rxcui, drug_name)
+            unreachable = not complete
+            if rxcui:
+                # Fire the RxCUI-dependent calls concurrently
+                (properties, classification, effects, interactions), failed = self._gather([
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_drug_properties, rxcui),
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_drug_class, rxcui),
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_adverse_effects, drug_name, rxcui),
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_drug_interactions, drug_name, rxcui)
+                ])
+                unreachable = unreachable or failed
+            
+            (pubchem_info,), failed = self._gather([pubchem_future])
+            return _assemble_details(
+                details,
+                properties=properties,
+                classification=classification,
+                effects=effects,
+                interactions=interactions,
+                pubchem_info=pubchem_info,
+                smiles=pubchem_info.get("smiles"),
+                # Gaps left by an unreachable source aren't real; don't pay for AI to fill them
+                allow_ai=not (unreachable or failed)
+            )
             
         except Exception as e:
             logger.error(f"Error fetching comprehensive info for {drug_name}: {str(e)}")
             return details
     
-    def _enhance_with_ai(self, details: Dict, drug_name: str) -> Dict:
-        """Use AI to fill in missing drug information, with fallback to static database."""
-        
-        # Static knowledge base for common drugs
-        drug_knowledge = {
-            'metformin': {
-                'dosage': 'Initial: 500 mg twice daily or 850 mg once daily with meals. Maximum: 2,550 mg/day in divided doses. Extended-release: 500-2,000 mg once daily with evening meal.',
-                'mechanism': 'Decreases hepatic glucose production, decreases intestinal absorption of glucose, and improves insulin sensitivity by increasing peripheral glucose uptake and utilization.',
-                'smiles': 'CN(C)C(=N)NC(=N)N'
-            },
-            'aspirin': {
-                'dosage': 'Pain/fever: 325-650 mg every 4-6 hours. Cardiovascular protection: 75-325 mg once daily. Maximum: 4,000 mg/day for pain.',
-                'mechanism': 'Inhibits cyclooxygenase (COX) enzymes, reducing prostaglandin synthesis. Irreversibly acetylates COX-1 and COX-2, preventing platelet aggregation and reducing inflammation, pain, and fever.',
-                'smiles': 'CC(=O)Oc1ccccc1C(=O)O'
-            },
-            'ibuprofen': {
-                'dosage': 'Adults: 200-400 mg every 4-6 hours as needed. Maximum: 3,200 mg/day (prescription strength) or 1,200 mg/day (OTC).',
-                'mechanism': 'Nonsteroidal anti-inflammatory drug (NSAID) that inhibits COX-1 and COX-2 enzymes, reducing prostaglandin synthesis and providing anti-inflammatory, analgesic, and antipyretic effects.',
-                'smiles': 'CC(C)Cc1ccc(cc1)C(C)C(=O)O'
-            },
-            'lisinopril': {
-                'dosage': 'Hypertension: Initial 10 mg once daily, usual range 20-40 mg/day. Heart failure: Initial 5 mg once daily, target 20-40 mg/day.',
-                'mechanism': 'ACE inhibitor that prevents conversion of angiotensin I to angiotensin II, reducing vasoconstriction and aldosterone secretion, thereby lowering blood pressure and reducing cardiac workload.',
-                'smiles': 'NCCCC[C@H](N[C@@H](CCc1ccccc1)C(=O)O)C(=O)N1CCC[C@H]1C(=O)O'
-            },
-            'atorvastatin': {
-                'dosage': 'Initial: 10-20 mg once daily. Usual range: 10-80 mg once daily. Can be taken at any time without regard to meals.',
-                'mechanism': 'HMG-CoA reductase inhibitor (statin) that competitively inhibits the rate-limiting enzyme in cholesterol biosynthesis, reducing LDL cholesterol and total cholesterol levels.',
-                'smiles': 'CC(C)c1c(c(c(n1CC[C@H](C[C@H](CC(=O)O)O)O)c2ccc(cc2)F)c3ccccc3)C(=O)Nc4ccccc4'
-            },
-            'omeprazole': {
-                'dosage': 'GERD: 20 mg once daily for 4-8 weeks. H. pylori: 20 mg twice daily (with antibiotics). Best taken before meals.',
-                'mechanism': 'Proton pump inhibitor that suppresses gastric acid secretion by irreversibly blocking the H+/K+-ATPase enzyme system in gastric parietal cells.',
-                'smiles': 'COc1ccc2c(c1)[nH]c(n2)S(=O)Cc3ncc(c(c3C)OC)C'
-            }
-        }
-        
-        drug_lower = drug_name.lower()
-        
-        # Check static knowledge base first
-        if drug_lower in drug_knowledge:
-            knowledge = drug_knowledge[drug_lower]
-            if details.get('dosage') == 'Information not available' or details.get('dosage') == 'Dosage information not available':
-                details['dosage'] = knowledge.get('dosage', details['dosage'])
-            if details.get('mechanism') in ['Information not available', 'Mechanism of action not available', 'Description not available']:
-                details['mechanism'] = knowledge.get('mechanism', details['mechanism'])
-            if not details.get('smiles') or details['smiles'] == 'Not available':
-                details['smiles'] = knowledge.get('smiles', details.get('smiles'))
-            return details
+    def _gather(self, futures: List[Future]) -> Tuple[List[Any], bool]:
+        """
+        Wait for _fetch futures.
         
-        # Try AI enhancement for drugs not in static database
-        try:
-            from utils.api_client import get_api_client
-            
-            missing_fields = []
-            if details.get('dosage') in ['Information not available', 'Dosage information not available']:
-                missing_fields.append('dosage')
-            if details.get('mechanism') in ['Information not available', 'Mechanism of action not available', 'Description not available']:
-                missing_fields.append('mechanism')
-            if not details.get('smiles'):
-                missing_fields.append('structure')
-            
-            if not missing_fields:
-                return details
-            
-            # Get AI-powered information
-            api_client = get_api_client()
-            
-            prompt = f"""Provide concise information for the drug "{drug_name}":
-"""
-            
-            if 'dosage' in missing_fields:
-                prompt += "\n1. DOSAGE: Typical adult dosage (2-3 sentences)"
-            if 'mechanism' in missing_fields:
-                prompt += "\n2. MECHANISM OF ACTION: How the drug works (2-3 sentences)"
-            if 'structure' in missing_fields:
-                prompt += "\n3. SMILES: SMILES notation for molecular structure (just the SMILES string)"
-            
-            prompt += "\n\nFormat your response as:\nDOSAGE: [info]\nMECHANISM: [info]\nSMILES: [notation]"
-            
-            response = api_client.chat_completion(
-                messages=[
-                    {"role": "system", "content": "You are a pharmaceutical database assistant. Provide accurate, concise drug information."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=300
-            )
-            
-            content = response.choices[0].message.content
-            if content:
-                # Parse response
-                lines = content.strip().split('\n')
-                for line in lines:
-                    if line.startswith('DOSAGE:') and 'dosage' in missing_fields:
-                        details['dosage'] = line.replace('DOSAGE:', '').strip()
-                    elif line.startswith('MECHANISM:') and 'mechanism' in missing_fields:
-                        details['mechanism'] = line.replace('MECHANISM:', '').strip()
-                    elif line.startswith('SMILES:') and 'structure' in missing_fields:
-                        smiles = line.replace('SMILES:', '').strip()
-                        if smiles and smiles != 'Not available':
-                            details['smiles'] = smiles
-            
-            return details
+        Args:
+            futures: Futures of _fetch calls
             
-        except Exception as e:
-            logger.error(f"Error enhancing with AI: {str(e)}")
-            return details
-
+        Returns:
+            Each future's result and whether any source was unreachable
+        """
+        results = []
+        unreachable = False
+        for future in futures:
+            value, complete = future.result()
+            results.append(value)
+            unreachable = unreachable or not complete
+        return results, unreachable
+    
     def get_smiles(self, drug_name: str) -> Optional[str]:
         """
         Get SMILES notation for a drug from PubChem.
         
+        Reads the SMILES fetched (and cached) by get_pubchem_info, so asking
+        for both costs no extra request.
+        
         Args:
             drug_name: Name of the drug
             
         Returns:
             SMILES string or None if not found
-        """
-        try:
-            # Get CID first
-            url = f"{self.pubchem_base}/compound/name/{drug_name}/cids/JSON"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            cid = data.get("IdentifierList", {}).get("CID", [None])[0]
-            
-            if not cid:
-                return None
-                
-            # Get SMILES using CID
-            url = f"{self.pubchem_base}/compound/cid/{cid}/property/CanonicalSMILES/JSON"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            properties = data.get("PropertyTable", {}).get("Properties", [{}])[0]
-            
-            return properties.get("CanonicalSMILES")
             
-        except Exception as e:
-            logger.error(f"Error fetching SMILES for {drug_name}: {str(e)}")
-            return None
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
+        """
+        return self.get_pubchem_info(drug_name).get("smiles")
             
+    @_ttl_cached(is_miss=_no_pubchem_record, stale_grace=STALE_GRACE_SECONDS)
     def get_pubchem_info(self, drug_name: str) -> Dict:
         """
         Get drug information from PubChem.
@@ -744,79 +1601,53 @@ class DrugInfoFetcher:
             
         Returns:
             Dictionary with drug information
+            
+        Raises:
+            requests.RequestException: Only for request errors that are neither
+                transient nor an HTTP status, e.g. too many redirects
         """
-        info = {
-            "description": "Description not available",
-            "molecular_formula": "N/A",
-            "molecular_weight": "N/A",
-            "iupac_name": "N/A",
-            "synonyms": []
-        }
+        info = _empty_pubchem_info()
+        
+        # Description and synonyms can be looked up by name too, so all three
+        # requests go out at once instead of waiting for the CID
+        properties_url, description_url, synonyms_url = _pubchem_urls(self.pubchem_base, drug_name)
+        description_future = _PUBCHEM_EXECUTOR.submit(self._get, description_url)
+        synonyms_future = _PUBCHEM_EXECUTOR.submit(self._get, synonyms_url)
+        complete = True
         
         try:
-            # Get CID (Compound ID)
-            url = f"{self.pubchem_base}/compound/name/{drug_name}/cids/JSON"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            cid = data.get("IdentifierList", {}).get("CID", [None])[0]
-            
-            if not cid:
+            # Resolve the name and fetch properties (including the CID) in one request
+            response = self._session_get(properties_url, timeout=10)
+            if response.status_code == 404:
+                # Unknown name; cached briefly as a miss by _ttl_cached
                 return info
+            _check_status(response)
             
-            # Get compound properties
-            url = f"{self.pubchem_base}/compound/cid/{cid}/property/MolecularFormula,MolecularWeight,IUPACName/JSON"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            properties = data.get("PropertyTable", {}).get("Properties", [{}])[0]
-            
-            info["molecular_formula"] = properties.get("MolecularFormula", "N/A")
-            info["molecular_weight"] = properties.get("MolecularWeight", "N/A")
-            info["iupac_name"] = properties.get("IUPACName", "N/A")
-            
-            # Get description
-            url = f"{self.pubchem_base}/compound/cid/{cid}/description/JSON"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                descriptions = data.get("InformationList", {}).get("Information", [])
-                if descriptions:
-                    info["description"] = descriptions[0].get("Description", "Description not available")
+            properties = _pubchem_properties(_json_body(response))
+            if properties is None:
+                return info
+            info.update(properties)
             
-            # Get synonyms
-            url = f"{self.pubchem_base}/compound/cid/{cid}/synonyms/JSON"
-            response = self.session.get(url, timeout=10)
+            description_data, complete = self._attempt("PubChem", description_future.result)
+            if description_data is not None:
+                info["description"] = _pubchem_description(description_data)
             
-            if response.status_code == 200:
-                data = response.json()
-                synonyms = data.get("InformationList", {}).get("Information", [{}])[0].get("Synonym", [])
-                info["synonyms"] = synonyms[:10]  # Limit to 10 synonyms
+            synonyms_data, reached = self._attempt("PubChem", synonyms_future.result)
+            complete = complete and reached
+            if synonyms_data is not None:
+                info["synonyms"] = _pubchem_synonyms(synonyms_data)
             
-        except Exception as e:
+        except _PERMANENT_ERRORS as e:
             logger.error(f"Error fetching PubChem info for {drug_name}: {str(e)}")
+        except _TRANSIENT_ERRORS as e:
+            logger.warning(f"PubChem unreachable while fetching {drug_name}: {str(e)}")
+            complete = False
+        finally:
+            # Nothing to wait for if the name didn't resolve
+            description_future.cancel()
+            synonyms_future.cancel()
         
-        return info
-
-    def _get_drug_uses(self, drug_name: str) -> str:
-        """Return common uses for a small set of well-known drugs as a fallback."""
-        common_uses = {
-            "aspirin": "Pain relief, fever reduction, anti-inflammatory, and prevention of blood clots",
-            "ibuprofen": "Pain relief, fever reduction, anti-inflammatory",
-            "paracetamol": "Pain relief and fever reduction",
-            "acetaminophen": "Pain relief and fever reduction",
-            "metformin": "Treatment of type 2 diabetes (improves insulin sensitivity)",
-            "atorvastatin": "Treatment of high cholesterol to reduce cardiovascular risk",
-            "omeprazole": "Reduction of gastric acid production for GERD and peptic ulcers",
-            "amoxicillin": "Treatment of bacterial infections (various indications)",
-            "lisinopril": "Treatment of high blood pressure and heart failure",
-            "caffeine": "Stimulant; sometimes used in headache preparations"
-        }
-
-        return common_uses.get(drug_name.strip().lower(), "Information not available")
+        return _result(info, complete)
     
     def get_mechanism_of_action(self, drug_name: str, drug_class: str) -> str:
         """
@@ -829,35 +1660,9 @@ class DrugInfoFetcher:
         Returns:
             Mechanism of action description
         """
-        # Common mechanisms for well-known drugs
-        mechanisms = {
-            "aspirin": "Irreversibly inhibits cyclooxygenase (COX) enzymes, reducing prostaglandin synthesis and platelet aggregation",
-            "ibuprofen": "Reversibly inhibits COX-1 and COX-2 enzymes, reducing prostaglandin synthesis and inflammation",
-            "paracetamol": "Inhibits prostaglandin synthesis in the CNS, affecting pain and fever centers",
-            "acetaminophen": "Inhibits prostaglandin synthesis in the CNS, affecting pain and fever centers",
-            "metformin": "Decreases hepatic glucose production, decreases intestinal glucose absorption, and improves insulin sensitivity",
-            "atorvastatin": "Inhibits HMG-CoA reductase, the rate-limiting enzyme in cholesterol synthesis",
-            "lisinopril": "Inhibits angiotensin-converting enzyme (ACE), reducing angiotensin II formation and lowering blood pressure",
-            "omeprazole": "Irreversibly inhibits the H+/K+ ATPase enzyme (proton pump) in gastric parietal cells",
-            "amoxicillin": "Inhibits bacterial cell wall synthesis by binding to penicillin-binding proteins",
-            "metoprolol": "Selectively blocks beta-1 adrenergic receptors in the heart, reducing heart rate and contractility"
-        }
-        
-        drug_lower = drug_name.lower()
-        if drug_lower in mechanisms:
-            return mechanisms[drug_lower]
-        
-        # Generic mechanism based on drug class
-        if "analgesic" in drug_class.lower():
-            return "Reduces pain perception through various mechanisms affecting pain pathways"
-        elif "antibiotic" in drug_class.lower():
-            return "Inhibits bacterial growth or kills bacteria through various mechanisms"
-        elif "antihypertensive" in drug_class.lower():
-            return "Lowers blood pressure through various mechanisms affecting cardiovascular system"
-        else:
-            return "Mechanism of action varies based on drug class and target"
-    
-    def get_adverse_effects(self, drug_class: str) -> List[str]:
+        return _mechanism_for(drug_name.lower(), drug_class.lower())
+    
+    def get_class_adverse_effects(self, drug_class: str) -> List[str]:
         """
         Get common adverse effects based on drug class.
         
@@ -867,22 +1672,7 @@ class DrugInfoFetcher:
         Returns:
             List of common adverse effects
         """
-        # Common adverse effects by drug class
-        effects_map = {
-            "analgesic": ["Nausea", "Gastric irritation", "Dizziness", "Liver toxicity (overdose)"],
-            "nsaid": ["Gastric ulceration", "Bleeding", "Renal impairment", "Cardiovascular events"],
-            "antibiotic": ["Diarrhea", "Nausea", "Allergic reactions", "Antibiotic resistance"],
-            "antihypertensive": ["Dizziness", "Fatigue", "Headache", "Electrolyte imbalance"],
-            "statin": ["Muscle pain", "Liver enzyme elevation", "Digestive problems", "Memory issues"],
-            "antidiabetic": ["Hypoglycemia", "Gastrointestinal upset", "Weight changes", "Lactic acidosis (rare)"]
-        }
-        
-        drug_class_lower = drug_class.lower()
-        for key, effects in effects_map.items():
-            if key in drug_class_lower:
-                return effects
-        
-        return ["Common: Nausea, headache, dizziness", "Consult healthcare provider for complete list"]
+        return list(_class_effects(drug_class.lower()))
     
     def get_comprehensive_drug_info(self, drug_name: str) -> Dict:
         """
@@ -894,57 +1684,37 @@ class DrugInfoFetcher:
         Returns:
             Dictionary with complete drug information
         """
-        result = {
-            "drug_name": drug_name.title(),
-            "status": "success",
-            "rxcui": None,
-            "drug_class": "Not available",
-            "mechanism_of_action": "Not available",
-            "uses": "Not available",
-            "adverse_effects": [],
-            "drug_interactions": [],
-            "food_interactions": "Avoid alcohol unless specifically advised by healthcare provider",
-            "molecular_info": {},
-            "error": None
-        }
+        result = _empty_comprehensive_info(drug_name)
         
         try:
+            # PubChem lookup doesn't depend on the RxCUI, so start it right away
+            pubchem_future = _FANOUT_EXECUTOR.submit(self._fetch, self.get_pubchem_info, drug_name)
+            
             # Get RxCUI
-            rxcui = self.get_rxcui(drug_name)
+            rxcui, complete = self._fetch(self.get_rxcui, drug_name)
+            unreachable = not complete
             if not rxcui:
                 result["status"] = "partial"
-                result["error"] = "Drug not found in RxNav database"
+                result["error"] = "RxNav is not responding" if unreachable else "Drug not found in RxNav database"
                 # Still try PubChem
             else:
                 result["rxcui"] = rxcui
                 
-                # Get drug class
-                drug_class = self.get_drug_class(rxcui)
-                result["drug_class"] = drug_class
-                
-                # Get interactions (pass drug_name, not rxcui)
-                interactions = self.get_drug_interactions(drug_name)
-                result["drug_interactions"] = interactions
+                # Get drug class and interactions concurrently
+                (result["drug_class"], result["drug_interactions"]), unreachable = self._gather([
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_drug_class, rxcui),
+                    _FANOUT_EXECUTOR.submit(self._fetch, self.get_drug_interactions, drug_name, rxcui)
+                ])
                 
                 # Get adverse effects
-                result["adverse_effects"] = self.get_adverse_effects(drug_class)
+                result["adverse_effects"] = self.get_class_adverse_effects(result["drug_class"])
             
-            # Get PubChem information
-            pubchem_info = self.get_pubchem_info(drug_name)
-            result["molecular_info"] = pubchem_info
-            # Use PubChem description when available; otherwise fall back to
-            # a small built-in mapping of common uses for popular drugs.
-            pubchem_description = (pubchem_info.get("description") or "").strip()
-            if pubchem_description and pubchem_description.lower() != "description not available":
-                result["uses"] = pubchem_description
-            else:
-                result["uses"] = self._get_drug_uses(drug_name)
+            # Get mechanism of action while the PubChem lookup is still in flight
+            result["mechanism_of_action"] = self.get_mechanism_of_action(drug_name, result["drug_class"])
             
-            # Get mechanism of action
-            result["mechanism_of_action"] = self.get_mechanism_of_action(
-                drug_name, 
-                result["drug_class"]
-            )
+            # Get PubChem information
+            (pubchem_info,), pubchem_unreachable = self._gather([pubchem_future])
+            _finish_comprehensive_info(result, drug_name, pubchem_info, unreachable or pubchem_unreachable)
             
         except Exception as e:
             logger.error(f"Error in get_comprehensive_drug_info: {str(e)}")
@@ -952,8 +1722,7 @@ class DrugInfoFetcher:
             result["error"] = str(e)
         
         return result
-
-
+    
 # Convenience function for easy import
 def get_drug_info(drug_name: str) -> Dict:
     """
@@ -1,11 +1,16 @@
 # utils/email_service.py
+import html
 import smtplib
 import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
+from email.mime.base import MIMEBase
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from string import Template
 from typing import Optional, List, Tuple, Dict, Any
 import json
 from datetime import datetime
@@ -14,6 +19,49 @@ import logging
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Email body of send_analysis_report; fields are HTML-escaped before substitution
+_REPORT_TEMPLATE = Template("""
+        <h2>PharmaGenie AI Analysis Report</h2>
+        <p>Please find attached the analysis report for $drug_name.</p>
+        <p>Key findings:</p>
+        <ul>
+            <li>Score: $score</li>
+            <li>Indication: $indication</li>
+            <li>Analysis Date: $analysis_date</li>
+        </ul>
+        """)
+
+# Background sends started by send_analysis_report_async
+_SEND_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="email-send")
+
+
+def _render_pdf(analysis_data: dict, ts: datetime) -> bytes:
+    """Render an analysis report PDF."""
+    # This is a placeholder - in a real app, you'd use something like ReportLab
+    # or WeasyPrint to generate a proper PDF
+    from io import BytesIO
+    from reportlab.pdfgen import canvas
+    
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer)
+    
+    # Add content to PDF
+    p.drawString(100, 800, f"Analysis Report: {analysis_data.get('drug_name', 'Untitled')}")
+    p.drawString(100, 780, f"Date: {ts.strftime('%Y-%m-%d %H:%M')}")
+    p.drawString(100, 760, f"Score: {analysis_data.get('score', 'N/A')}")
+    
+    # Add more content as needed
+    y = 740
+    for key, value in analysis_data.items():
+        if key not in ['drug_name', 'score']:
+            p.drawString(100, y, f"{key}: {value}")
+            y -= 20
+    
+    p.save()
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -22,24 +70,88 @@ class EmailService:
         self.sender_password = os.getenv("SENDER_PASSWORD")
         self.ssl_context = ssl.create_default_context()
         
+        # Authenticated SMTP session reused across sends (opened on first use)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+        
         # Validate configuration on initialization
         if not all([self.smtp_server, self.sender_email, self.sender_password]):
             logger.warning("Email service not fully configured. Some features may not work.")
+    
+    def __del__(self):
+        self.close()
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open an SMTP connection, upgrade it to TLS when offered, and log in."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10)
+        try:
+            server.ehlo()
+            if server.has_extn('STARTTLS'):
+                server.starttls(context=self.ssl_context)
+                server.ehlo()
+            
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _ensure_connection(self) -> smtplib.SMTP:
+        """Get the cached SMTP session, connecting on first use. Call with self._lock held."""
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+    
+    def _drop_connection(self) -> None:
+        """Discard the cached SMTP session. Call with self._lock held."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+    
+    def _connection_lost(self, error: smtplib.SMTPException) -> bool:
+        """
+        Whether a failed send means the server dropped the cached session. Call with self._lock held.
+        
+        A server that expires an idle session may answer the next command
+        with 421 (smtplib then closes the socket and raises e.g.
+        SMTPSenderRefused) instead of just closing the connection.
+        """
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421:
+            return True
+        return self._smtp is not None and self._smtp.sock is None
+    
+    def close(self) -> None:
+        """Close the cached SMTP session, if one is open."""
+        # __del__ may run on a partially initialized instance
+        lock = getattr(self, '_lock', None)
+        if lock is None:
+            return
+        with lock:
+            self._drop_connection()
         
     def test_connection(self) -> Tuple[bool, str]:
         """Test the SMTP server connection and authentication."""
+        if not (self.sender_email and self.sender_password):
+            return False, "Missing email credentials"
+        
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
-                server.ehlo()
-                if server.has_extn('STARTTLS'):
-                    server.starttls(context=self.ssl_context)
-                    server.ehlo()
-                
-                if self.sender_email and self.sender_password:
-                    server.login(self.sender_email, self.sender_password)
-                    return True, "Successfully connected to SMTP server and authenticated"
-                else:
-                    return False, "Missing email credentials"
+            with self._lock:
+                if self._smtp is not None:
+                    # Reuse the open session if the server still answers
+                    try:
+                        code, _ = self._smtp.noop()
+                    except smtplib.SMTPServerDisconnected:
+                        code = None
+                    if code != 250:
+                        self._drop_connection()
+                self._ensure_connection()
+            return True, "Successfully connected to SMTP server and authenticated"
                     
         except smtplib.SMTPAuthenticationError as e:
             error_msg = (
@@ -63,7 +175,7 @@ class EmailService:
         to_email: str,
         subject: str,
         body: str,
-        attachments: Optional[List[Dict[str, Any]]] = None,
+        attachments: Optional[List[Any]] = None,
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None
     ) -> Tuple[bool, str]:
@@ -71,10 +183,12 @@ class EmailService:
         Send an email with optional attachments.
         
         Args:
-            to_email: Recipient email address(es) as comma-separated string or list
+            to_email: Recipient email address(es) as comma-separated string or list;
+                may be empty when bcc is given, and the To: header then reads
+                "undisclosed-recipients:;"
             subject: Email subject
             body: Email body (HTML)
-            attachments: List of dicts with 'data' and 'filename' keys
+            attachments: List of dicts with 'data' and 'filename' keys, or pre-built MIME parts
             cc: List of CC email addresses
             bcc: List of BCC email addresses
             
@@ -84,20 +198,20 @@ class EmailService:
         if not all([self.smtp_server, self.sender_email, self.sender_password]):
             return False, "Email service not properly configured. Check your environment variables."
             
-        if not to_email:
+        if not to_email and not bcc:
             return False, "No recipient email address provided"
 
         try:
             # Convert to_email to list if it's a string
             if isinstance(to_email, str):
-                to_emails = [email.strip() for email in to_email.split(',')]
+                to_emails = [email.strip() for email in to_email.split(',') if email.strip()]
             else:
-                to_emails = to_email
+                to_emails = list(to_email or [])
 
             # Create message
             msg = MIMEMultipart()
             msg['From'] = self.sender_email
-            msg['To'] = ', '.join(to_emails)
+            msg['To'] = ', '.join(to_emails) if to_emails else 'undisclosed-recipients:;'
             msg['Subject'] = subject
             
             # Add CC and BCC if provided
@@ -113,35 +227,39 @@ class EmailService:
             if attachments:
                 for attachment in attachments:
                     try:
-                        part = MIMEApplication(
-                            attachment.get('data', b''),
-                            Name=attachment.get('filename', 'attachment.bin')
-                        )
-                        part['Content-Disposition'] = f'attachment; filename="{attachment.get("filename", "file")}"'
-                        msg.attach(part)
+                        if isinstance(attachment, MIMEBase):
+                            # Pre-built part, e.g. shared across a broadcast
+                            msg.attach(attachment)
+                        else:
+                            part = MIMEApplication(
+                                attachment.get('data', b''),
+                                Name=attachment.get('filename', 'attachment.bin')
+                            )
+                            part['Content-Disposition'] = f'attachment; filename="{attachment.get("filename", "file")}"'
+                            msg.attach(part)
                     except Exception as e:
                         logger.error(f"Error attaching file: {e}")
                         continue
             
-            # Connect to server and send
-            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10) as server:
-                server.ehlo()
-                if server.has_extn('STARTTLS'):
-                    server.starttls(context=self.ssl_context)
-                    server.ehlo()
-                
-                server.login(self.sender_email, self.sender_password)
-                
-                # Combine all recipients
-                all_recipients = to_emails.copy()
-                if cc:
-                    all_recipients.extend(cc)
-                if bcc:
-                    all_recipients.extend(bcc)
-                
-                server.send_message(msg, from_addr=self.sender_email, to_addrs=all_recipients)
+            # Combine all recipients
+            all_recipients = to_emails.copy()
+            if cc:
+                all_recipients.extend(cc)
+            if bcc:
+                all_recipients.extend(bcc)
             
-            logger.info(f"Email sent successfully to {', '.join(to_emails)}")
+            # Send over the cached session, reconnecting once if the server dropped it
+            with self._lock:
+                try:
+                    self._ensure_connection().send_message(msg, from_addr=self.sender_email, to_addrs=all_recipients)
+                except smtplib.SMTPException as e:
+                    if not self._connection_lost(e):
+                        raise
+                    logger.info(f"SMTP session was dropped ({str(e)}); reconnecting")
+                    self._drop_connection()
+                    self._ensure_connection().send_message(msg, from_addr=self.sender_email, to_addrs=all_recipients)
+            
+            logger.info(f"Email sent successfully to {', '.join(to_emails) or f'{len(all_recipients)} Bcc recipients'}")
             return True, "Email sent successfully"
             
         except smtplib.SMTPAuthenticationError as e:
@@ -174,32 +292,57 @@ class EmailService:
             logger.error(error_msg, exc_info=True)
             return False, error_msg
 
+    def send_email_bulk(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        attachments: Optional[List[Any]] = None
+    ) -> Tuple[bool, str]:
+        """
+        Send the same email to many recipients in one SMTP transaction.
+        
+        One MIME message is built and delivered with a single MAIL FROM,
+        one RCPT TO per recipient and a single DATA, over the cached session.
+        Recipients are sent as Bcc: they only appear in the envelope, and the
+        To: header reads "undisclosed-recipients:;".
+        
+        Args:
+            to_emails: Recipient email addresses
+            subject: Email subject
+            body: Email body (HTML)
+            attachments: List of dicts with 'data' and 'filename' keys, or pre-built MIME parts
+            
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        return self.send_email([], subject, body, attachments=attachments, bcc=list(to_emails))
+
     def send_analysis_report(
         self,
         to_email: str,
         analysis_data: dict,
         format_type: str = "pdf"
     ) -> bool:
+        # One timestamp for the file name, email body and PDF
+        ts = datetime.now()
+        
         # Generate report
         if format_type.lower() == "pdf":
-            report_data = self._generate_pdf_report(analysis_data)
-            filename = f"analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            report_data = self._generate_pdf_report(analysis_data, ts)
+            filename = f"analysis_report_{ts.strftime('%Y%m%d_%H%M%S')}.pdf"
         else:
             report_data = json.dumps(analysis_data, indent=2).encode('utf-8')
-            filename = f"analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"analysis_report_{ts.strftime('%Y%m%d_%H%M%S')}.json"
         
         # Prepare email
         subject = f"Analysis Report: {analysis_data.get('drug_name', 'Untitled')}"
-        body = f"""
-        <h2>PharmaGenie AI Analysis Report</h2>
-        <p>Please find attached the analysis report for {analysis_data.get('drug_name', 'your drug')}.</p>
-        <p>Key findings:</p>
-        <ul>
-            <li>Score: {analysis_data.get('score', 'N/A')}</li>
-            <li>Indication: {analysis_data.get('indication', 'N/A')}</li>
-            <li>Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}</li>
-        </ul>
-        """
+        body = _REPORT_TEMPLATE.substitute(
+            drug_name=html.escape(str(analysis_data.get('drug_name', 'your drug'))),
+            score=html.escape(str(analysis_data.get('score', 'N/A'))),
+            indication=html.escape(str(analysis_data.get('indication', 'N/A'))),
+            analysis_date=ts.strftime('%Y-%m-%d %H:%M')
+        )
         
         # Send email
         return self.send_email(
@@ -212,27 +355,14 @@ class EmailService:
             }]
         )
     
-    def _generate_pdf_report(self, analysis_data: dict) -> bytes:
-        # This is a placeholder - in a real app, you'd use something like ReportLab
-        # or WeasyPrint to generate a proper PDF
-        from io import BytesIO
-        from reportlab.pdfgen import canvas
-        
-        buffer = BytesIO()
-        p = canvas.Canvas(buffer)
-        
-        # Add content to PDF
-        p.drawString(100, 800, f"Analysis Report: {analysis_data.get('drug_name', 'Untitled')}")
-        p.drawString(100, 780, f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        p.drawString(100, 760, f"Score: {analysis_data.get('score', 'N/A')}")
-        
-        # Add more content as needed
-        y = 740
-        for key, value in analysis_data.items():
-            if key not in ['drug_name', 'score']:
-                p.drawString(100, y, f"{key}: {value}")
-                y -= 20
-        
-        p.save()
-        buffer.seek(0)
-        return buffer.getvalue()
\ No newline at end of file
+    def send_analysis_report_async(
+        self,
+        to_email: str,
+        analysis_data: dict,
+        format_type: str = "pdf"
+    ) -> Future:
+        """Send an analysis report in the background; the future resolves to send_analysis_report's result."""
+        return _SEND_EXECUTOR.submit(self.send_analysis_report, to_email, analysis_data, format_type)
+    
+    def _generate_pdf_report(self, analysis_data: dict, ts: Optional[datetime] = None) -> bytes:
+        return _render_pdf(analysis_data, ts or datetime.now())
@@ -1,24 +1,56 @@
 import os
+import re
+import sqlite3
+import threading
+import time
 from dotenv import load_dotenv
 from pathlib import Path
 import json
-from typing import Dict, Any
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
 
+# Environment variables initialize_agents requires to be set and non-empty
+REQUIRED_ENV_VARS = frozenset({
+    'OPENAI_API_KEY',
+    'CLINICAL_TRIALS_API_KEY',
+    'PATENT_API_KEY'
+})
+
+# Directory holding the get_cached_data/cache_data database
+CACHE_DIR = Path("data/cache")
+# SQLite database of cache entries
+CACHE_DB = CACHE_DIR / "cache.sqlite"
+# Writes on a thread between sweeps of expired cache entries
+CACHE_PURGE_INTERVAL = 500
+
+# Runs of characters not allowed in generated report file names
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-z0-9_]+')
+
+# Per-thread state (SQLite connections can't be shared across threads)
+_local = threading.local()
+
+@lru_cache(maxsize=1)
 def initialize_agents() -> bool:
-    """Initialize all agents and verify required environment variables."""
-    required_vars = [
-        'OPENAI_API_KEY',
-        'CLINICAL_TRIALS_API_KEY',
-        'PATENT_API_KEY'
-    ]
+    """
+    Initialize all agents and verify required environment variables.
     
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    Success is memoized, so callers can invoke this freely; a failed
+    check is not cached and is re-run on the next call.
+    """
+    missing_vars = REQUIRED_ENV_VARS - {key for key, value in os.environ.items() if value}
     if missing_vars:
         raise EnvironmentError(
-            f"Missing required environment variables: {', '.join(missing_vars)}. "
+            f"Missing required environment variables: {', '.join(sorted(missing_vars))}. "
             "Please set them in the .env file."
         )
     
@@ -31,14 +63,17 @@ def initialize_agents() -> bool:
 def save_report(report_data: Dict[str, Any], filename: str = None) -> str:
     """Save analysis report to a JSON file."""
     if not filename:
-        drug_name = report_data.get('drug_name', 'report').lower().replace(' ', '_')
+        # Keep only file-name-safe characters so the drug name can't escape the reports directory
+        drug_name = _UNSAFE_FILENAME_RE.sub('_', str(report_data.get('drug_name', 'report')).lower())
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{drug_name}_{timestamp}.json"
     
     filepath = Path("data/reports") / filename
     
-    with open(filepath, 'w') as f:
-        json.dump(report_data, f, indent=2)
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+    else:
+        filepath.write_text(json.dumps(report_data, indent=2))
     
     return str(filepath)
 
@@ -49,19 +84,63 @@ def load_report(filename: str) -> Dict[str, Any]:
     if not filepath.exists():
         raise FileNotFoundError(f"Report not found: {filepath}")
     
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    data = filepath.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def _cache_db() -> sqlite3.Connection:
+    """Get this thread's connection to the cache database, creating it on first use."""
+    conn = getattr(_local, "cache_db", None)
+    if conn is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB, timeout=10, isolation_level=None)
+        # WAL lets readers proceed while another thread or process writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at)")
+        _purge_expired(conn)
+        _local.cache_db = conn
+        _local.cache_writes = 0
+    return conn
+
+def _purge_expired(conn: sqlite3.Connection) -> None:
+    """Delete expired cache entries; reads already ignore them, this only reclaims space."""
+    conn.execute("DELETE FROM kv WHERE expires_at < ?", (time.time(),))
 
 def get_cached_data(key: str) -> Any:
-    """Get cached data if available."""
-    cache_file = Path(f"data/cache/{key}.json")
-    if cache_file.exists():
-        with open(cache_file, 'r') as f:
-            return json.load(f)
-    return None
+    """Get cached data if available and not expired."""
+    row = _cache_db().execute("SELECT value, expires_at FROM kv WHERE key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    
+    value, expires_at = row
+    if expires_at is not None and time.time() >= expires_at:
+        return None
+    return orjson.loads(value) if ORJSON_AVAILABLE else json.loads(value)
 
-def cache_data(key: str, data: Any) -> None:
-    """Cache data for future use."""
-    cache_file = Path(f"data/cache/{key}.json")
-    with open(cache_file, 'w') as f:
-        json.dump(data, f)
+def cache_data(key: str, data: Any, ttl: Optional[float] = None) -> None:
+    """
+    Cache data for future use.
+    
+    Entries live in one SQLite database; each write replaces the key's
+    row in a single statement, so a concurrent reader never sees a
+    half-written entry. Expired rows are deleted when a thread first
+    connects and then every CACHE_PURGE_INTERVAL writes.
+    
+    Args:
+        key: Cache key
+        data: JSON-serializable data
+        ttl: Seconds until the entry expires (kept indefinitely if omitted)
+    """
+    value = orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode('utf-8')
+    expires_at = time.time() + ttl if ttl is not None else None
+    conn = _cache_db()
+    conn.execute(
+        "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+        (key, value, expires_at)
+    )
+    
+    _local.cache_writes += 1
+    if _local.cache_writes >= CACHE_PURGE_INTERVAL:
+        _local.cache_writes = 0
+        _purge_expired(conn)
@@ -1,23 +1,36 @@
 # utils/molecule_viz.py
 """Module for handling molecular visualization using RDKit"""
 
+from __future__ import annotations
+
 import streamlit as st
 import streamlit.components.v1 as components
 import requests
 import json
 import io
+import re
 import time
 import random
+import threading
+from collections import deque
 from typing import (
     TYPE_CHECKING, Any, Optional, Union, Dict, Tuple, TypeVar, 
-    List, Callable, cast
+    List, Callable, Deque, Mapping, cast
 )
 from pathlib import Path
-from PIL import Image
+from types import MappingProxyType
+from functools import lru_cache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib.parse import quote_plus
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 # Type variable for RDKit molecule and related types
 T = TypeVar('T')
 MoleculeType = TypeVar('MoleculeType')
@@ -29,64 +42,305 @@ if TYPE_CHECKING:
         Draw, AllChem, rdDepictor, Descriptors, Lipinski,
         rdchem, rdDepictor
     )
-    RDKit_AVAILABLE = True
+    from rdkit.Chem.Draw import rdMolDraw2D
     RDKitMol = rdchem.Mol
 else:
+    # RDKit is imported on first use by _get_rdkit(); importing its drawing
+    # and force-field modules pulls in Boost/Cairo and slows every page load
+    Chem = cast(Any, None)
+    Draw = cast(Any, None)
+    rdMolDraw2D = cast(Any, None)
+    AllChem = cast(Any, None)
+    rdDepictor = cast(Any, None)
+    Descriptors = cast(Any, None)
+    Lipinski = cast(Any, None)
+    RDKitMol = cast(Any, None)
+
+# None until the first import attempt, then whether RDKit could be imported
+RDKit_AVAILABLE: Optional[bool] = None
+
+
+def _get_rdkit() -> bool:
+    """
+    Import RDKit into the module globals the first time it is needed.
+    
+    Returns:
+        True if RDKit is available, False otherwise
+    """
+    global Chem, Draw, rdMolDraw2D, AllChem, rdDepictor, Descriptors, Lipinski, RDKitMol
+    global RDKit_AVAILABLE
+    if RDKit_AVAILABLE is not None:
+        return RDKit_AVAILABLE
+    
     try:
-        from rdkit import Chem
+        from rdkit import Chem as _Chem
         from rdkit.Chem import (
-            Draw, AllChem, rdDepictor, Descriptors, Lipinski
+            Draw as _Draw, AllChem as _AllChem, rdDepictor as _rdDepictor,
+            Descriptors as _Descriptors, Lipinski as _Lipinski
         )
-        RDKit_AVAILABLE = True
-        RDKitMol = Chem.rdchem.Mol
+        from rdkit.Chem.Draw import rdMolDraw2D as _rdMolDraw2D
     except Exception as e:
         # If RDKit is missing, don't crash but show warning
         RDKit_AVAILABLE = False
-        Chem = cast(Any, None)
-        Draw = cast(Any, None)
-        AllChem = cast(Any, None)
-        rdDepictor = cast(Any, None)
-        Descriptors = cast(Any, None)
-        Lipinski = cast(Any, None)
-        RDKitMol = cast(Any, None)
         st.warning(
             f"RDKit import failed: {e}\n"
             "If running on Streamlit Cloud, add required system packages (see README)."
         )
-import py3Dmol
-import streamlit.components.v1 as components
-import requests
-from typing import Optional, Tuple, Dict, Any
-import io
-import time
-import random
-from PIL import Image
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from urllib.parse import quote_plus
-from functools import lru_cache
+        return False
+    
+    Chem, Draw, rdMolDraw2D, AllChem = _Chem, _Draw, _rdMolDraw2D, _AllChem
+    rdDepictor, Descriptors, Lipinski = _rdDepictor, _Descriptors, _Lipinski
+    RDKitMol = _Chem.rdchem.Mol
+    RDKit_AVAILABLE = True
+    return True
+
+
+from utils.helpers import cache_data, get_cached_data
+
+# PubChem JSON decoder; orjson parses the response bytes several times faster
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Runs of characters not allowed in download file names
+_NON_ALNUM = re.compile(r'[^A-Za-z0-9]+')
+
+# How long fetched SMILES are kept in the on-disk cache (PubChem structures rarely change)
+SMILES_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def _create_session() -> requests.Session:
+    """Create a requests session with retry logic and a small keep-alive pool."""
+    session = requests.Session()
+    # 429 is left to the callers, which wait for Retry-After and go back
+    # through _PUBCHEM_LIMITER; adapter retries would bypass the limiter
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET", "POST"]
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every PubChem call in this module, so connections stay open across reruns
+_SESSION = _create_session()
+
+# Built-in structures for common drugs, used when PubChem has no answer
+_COMMON_SMILES: Mapping[str, str] = MappingProxyType({
+    'aspirin': 'CC(=O)OC1=CC=CC=C1C(=O)O',
+    'ibuprofen': 'CC(C)CC1=CC=C(C=C1)C(C)C(=O)O',
+    'paracetamol': 'CC(=O)NC1=CC=C(C=C1)O',
+    'metformin': 'CN(C)C(=N)NC(=N)N',
+    'atorvastatin': 'CC(C)C(C(=O)O)CC1=CC=C(C=C1)C2=C(C(=C(N2C(=O)C3=CC=CC=C3C4=CC=CC=C4)C)CC5=CC=CC=C5)C'
+})
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _compute_3d_sdf(canonical_smiles: str) -> Optional[str]:
+    """
+    Embed and force-field optimize a molecule in 3D, cached by canonical SMILES.
+    
+    Args:
+        canonical_smiles: Canonical SMILES of the molecule
+        
+    Returns:
+        SDF block of the 3D conformer, or None if embedding fails
+    """
+    # Make a quick 3D conformer (single embed) and produce an SDF block
+    mol3 = Chem.AddHs(_mol_from_smiles(canonical_smiles))
+    embed_res = AllChem.EmbedMolecule(mol3, randomSeed=42)
+    if embed_res != 0:
+        return None
+    try:
+        AllChem.MMFFOptimizeMolecule(mol3, maxIters=120)
+    except Exception:
+        pass
+    
+    return Chem.MolToMolBlock(mol3)
+
+
+# 3Dmol.js viewer page for draw_3d_molecule (str.format placeholders: data_js, width, height)
+_HTML_3D_TEMPLATE = Path(__file__).with_name("viewer_3d.html").read_text(encoding="utf-8")
+
+# Unicode escapes for characters that could end an inline <script> block
+_SCRIPT_SAFE = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026'})
+
+@st.cache_data(ttl=60 * 60, show_spinner=False)
+def _render_2d_png(canonical_smiles: str, size: Tuple[int, int]) -> bytes:
+    """
+    Depict a molecule and encode it as PNG, cached by canonical SMILES.
+    
+    Args:
+        canonical_smiles: Canonical SMILES of the molecule
+        size: Tuple of (width, height) for the image
+        
+    Returns:
+        PNG image bytes
+    """
+    # Generate 2D coordinates on a copy; parsed mols are shared
+    mol = Chem.Mol(_mol_from_smiles(canonical_smiles))
+    rdDepictor.Compute2DCoords(mol)
+    img = Draw.MolToImage(mol, size=size)
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@st.cache_data(ttl=60 * 60, show_spinner=False)
+def _render_2d_svg(canonical_smiles: str, size: Tuple[int, int]) -> str:
+    """
+    Depict a molecule as SVG markup, cached by canonical SMILES.
+    
+    Uses RDKit's SVG drawer directly, so there is no Cairo rasterization
+    or PIL image, and the result scales without pixelation.
+    
+    Args:
+        canonical_smiles: Canonical SMILES of the molecule
+        size: Tuple of (width, height) for the drawing
+        
+    Returns:
+        SVG document as a string
+    """
+    drawer = rdMolDraw2D.MolDraw2DSVG(*size)
+    # Kekulizes, adds wedge bonds and computes 2D coordinates on a copy
+    rdMolDraw2D.PrepareAndDrawMolecule(drawer, _mol_from_smiles(canonical_smiles))
+    drawer.FinishDrawing()
+    return drawer.GetDrawingText()
+
+
+@st.cache_data(ttl=60 * 60, show_spinner=False)
+def _compute_properties(canonical_smiles: str) -> Dict[str, PropertyType]:
+    """
+    Calculate the drug-likeness properties shown by show_molecule.
+    
+    Args:
+        canonical_smiles: Canonical SMILES of the molecule
+        
+    Returns:
+        Dictionary mapping display label to value (floats rounded to 2 places)
+    """
+    mol = _mol_from_smiles(canonical_smiles)
+    return {
+        'Molecular Weight': round(Descriptors.ExactMolWt(mol), 2),
+        'LogP': round(Descriptors.MolLogP(mol), 2),
+        'H-Bond Donors': Lipinski.NumHDonors(mol),
+        'H-Bond Acceptors': Lipinski.NumHAcceptors(mol),
+        'Rotatable Bonds': Lipinski.NumRotatableBonds(mol),
+        'Heavy Atoms': mol.GetNumHeavyAtoms()
+    }
+
+
+@st.cache_data(ttl=60 * 60, show_spinner=False)
+def _mol_to_sdf(canonical_smiles: str) -> str:
+    """
+    Write a molecule as an SDF block for download, cached by canonical SMILES.
+    
+    Args:
+        canonical_smiles: Canonical SMILES of the molecule
+        
+    Returns:
+        SDF (MOL block) text
+    """
+    return Chem.MolToMolBlock(_mol_from_smiles(canonical_smiles))
+
+
+# PubChem's documented request limit per second
+PUBCHEM_CALLS_PER_SECOND = 5
+
+
+class _RateLimiter:
+    """
+    Blocking limit of at most `calls` requests in any `period`-second window.
+    
+    The times of the last `calls` requests are kept, so unlike fixed windows
+    there is no double-rate burst around a window boundary.
+    """
+    
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self._sent: Deque[float] = deque(maxlen=calls)
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until another request fits within the limit."""
+        # Waiting while holding the lock makes callers take their turns in order
+        with self._lock:
+            if len(self._sent) == self.calls:
+                wait = self._sent[0] + self.period - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            self._sent.append(time.monotonic())
+
+
+# Shared by every PubChem request in this module
+_PUBCHEM_LIMITER = _RateLimiter(PUBCHEM_CALLS_PER_SECOND, 1.0)
+
+
+@lru_cache(maxsize=1024)
+def _mol_from_smiles(smiles: str) -> Optional[Any]:
+    """
+    Parse a SMILES string once per distinct string.
+    
+    The returned Mol is shared between callers; copy it with Chem.Mol
+    before changing it (e.g. adding coordinates).
+    """
+    return Chem.MolFromSmiles(smiles)
+
+
+def _disk_cache_get(key: str) -> Any:
+    """Read a PubChem lookup from the on-disk cache, treating cache errors as a miss."""
+    try:
+        return get_cached_data(key)
+    except Exception:
+        return None
+
+
+def _disk_cache_put(key: str, value: Any) -> None:
+    """Store a PubChem lookup in the on-disk cache; failures only cost a later refetch."""
+    try:
+        cache_data(key, value, ttl=SMILES_CACHE_TTL_SECONDS)
+    except Exception:
+        pass
 
 
 @st.cache_data(ttl=60 * 60 * 24)
 def fetch_smiles_from_pubchem(drug_name: str) -> Optional[str]:
     """Simple cached fetch of CanonicalSMILES from PubChem by name.
 
+    Results are also kept in the on-disk cache, so names seen before a
+    server restart don't go back to PubChem.
+
     Returns the SMILES string or None on failure.
     """
     if not drug_name:
         return None
 
+    cache_key = f"smiles:{drug_name.strip().lower()}"
+    cached = _disk_cache_get(cache_key)
+    if cached:
+        return cached
+
     try:
         url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{quote_plus(drug_name)}/property/CanonicalSMILES/JSON"
-        resp = requests.get(url, timeout=10, headers={
-            'User-Agent': 'PharmaGenieAI/1.0',
-            'Accept': 'application/json'
-        })
+        for attempt in range(2):
+            _PUBCHEM_LIMITER.acquire()
+            resp = _SESSION.get(url, timeout=10, headers={
+                'User-Agent': 'PharmaGenieAI/1.0',
+                'Accept': 'application/json'
+            })
+            if resp.status_code != 429 or attempt == 1:
+                break
+            # Rate limited anyway (e.g. by another process); wait as asked, then retry once
+            time.sleep(int(resp.headers.get('Retry-After', 5)) + random.uniform(0, 1))
         if resp.status_code == 200:
-            j = resp.json()
+            j = _loads(resp.content)
             props = j.get('PropertyTable', {}).get('Properties', [])
             if props and 'CanonicalSMILES' in props[0]:
-                return props[0]['CanonicalSMILES']
+                smiles = props[0]['CanonicalSMILES']
+                _disk_cache_put(cache_key, smiles)
+                return smiles
     except Exception:
         return None
 
@@ -94,19 +348,15 @@ def fetch_smiles_from_pubchem(drug_name: str) -> Optional[str]:
 
 class MoleculeVisualizer:
     def __init__(self):
-        self.pubchem_urls = [
-            "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound",
-            "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound"  # Can add more mirrors here
-        ]
-        self.current_url_index = 0
-        self.session = self._create_session()
+        self.pubchem_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound"
+        self.session = _SESSION
         # simple in-memory cache for this visualizer instance (avoids repeat work
         # during a single page interaction)
         self._local_smiles_cache: Dict[str, str] = {}
         
     def _ensure_rdkit(self) -> bool:
         """Return True if RDKit is available, otherwise show an error and return False."""
-        if not RDKit_AVAILABLE:
+        if not _get_rdkit():
             st.error(
                 "RDKit is not installed or required system libraries are missing (e.g. libXrender).\n"
                 "On Streamlit Cloud add the required system packages listed in `packages.txt` at the repo root: libxrender1, libxext6, libx11-6, libsm6, libice6, libgl1-mesa-glx, etc."
@@ -118,7 +368,7 @@ class MoleculeVisualizer:
         self, 
         smiles: str, 
         size: tuple[int, int] = (300, 300)
-    ) -> Optional[Image.Image]:
+    ) -> Optional[bytes]:
         """
         Generate a 2D image of a molecule from its SMILES string.
         
@@ -127,7 +377,7 @@ class MoleculeVisualizer:
             size: Tuple of (width, height) for the image
             
         Returns:
-            PIL Image object or None if generation fails
+            PNG image bytes or None if generation fails
         """
         if not self._ensure_rdkit():
             return None
@@ -137,54 +387,37 @@ class MoleculeVisualizer:
                 return None
                 
             # Convert SMILES to RDKit molecule
-            mol = Chem.MolFromSmiles(smiles)
+            mol = _mol_from_smiles(smiles)
             if mol is None:
                 st.warning(f"Could not parse SMILES: {smiles}")
                 return None
                 
-            # Generate 2D coordinates if they don't exist
-            if not mol.GetNumConformers():
-                rdDepictor.Compute2DCoords(mol)
-                
-            # Draw the molecule
-            return Draw.MolToImage(mol, size=size)
+            # Draw the molecule (cached per structure across reruns)
+            return _render_2d_png(Chem.MolToSmiles(mol), tuple(size))
             
         except Exception as e:
             st.error(f"Error generating molecule image: {str(e)}")
             return None
         
-    def _create_session(self):
-        """Create a requests session with retry logic."""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        return session
-        
-    def _switch_url(self):
-        """Switch to the next available PubChem URL."""
-        self.current_url_index = (self.current_url_index + 1) % len(self.pubchem_urls)
-        time.sleep(1)  # Add a small delay when switching URLs
-        
     def _make_pubchem_request(
         self,
         endpoint: str,
         params: Optional[Dict[str, Any]] = None
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-        """Make a request to PubChem with retry logic."""
+        """
+        Make a request to PubChem with retry logic.
+        
+        Only a 429 waits before retrying (for the server's Retry-After);
+        other error statuses are returned at once, and connection errors
+        are retried straight away since the session adapter already backs off.
+        """
         max_retries = 2
         last_error = None
+        url = f"{self.pubchem_url}/{endpoint}"
         
         for attempt in range(max_retries):
-            base_url = self.pubchem_urls[self.current_url_index]
-            url = f"{base_url}/{endpoint}"
-            
             try:
+                _PUBCHEM_LIMITER.acquire()
                 response = self.session.get(
                     url,
                     params=params,
@@ -196,19 +429,17 @@ class MoleculeVisualizer:
                 )
                 
                 if response.status_code == 200:
-                    return response.json(), None
+                    return _loads(response.content), None
                 elif response.status_code == 429:  # Too Many Requests
                     retry_after = int(response.headers.get('Retry-After', 5))
                     time.sleep(retry_after + random.uniform(0, 1))
-                    self._switch_url()
+                    last_error = "PubChem rate limit exceeded"
                     continue
                 else:
-                    self._switch_url()
+                    return None, f"PubChem returned HTTP {response.status_code}"
                     
             except requests.exceptions.RequestException as e:
                 last_error = str(e)
-                self._switch_url()
-                time.sleep(1)  # Add a small delay before retrying
                 
         return None, last_error or "Unknown error occurred"
         
@@ -235,7 +466,7 @@ class MoleculeVisualizer:
         smiles = fetch_smiles_from_pubchem(drug_name)
         if smiles:
             try:
-                mol = Chem.MolFromSmiles(smiles)
+                mol = _mol_from_smiles(smiles)
                 if mol:
                     # cache for this instance as well
                     try:
@@ -246,18 +477,11 @@ class MoleculeVisualizer:
             except Exception:
                 pass
 
-        # Fallback: simple local synonyms (keeps logic minimal)
-        lower_name = drug_name.strip().lower()
-        common_names = {
-            'aspirin': 'CC(=O)OC1=CC=CC=C1C(=O)O',
-            'ibuprofen': 'CC(C)CC1=CC=C(C=C1)C(C)C(=O)O',
-            'paracetamol': 'CC(=O)NC1=CC=C(C=C1)O',
-            'metformin': 'CN(C)CCN=C(N)N',
-            'atorvastatin': 'CC(C)C(C(=O)O)CC1=CC=C(C=C1)C2=C(C(=C(N2C(=O)C3=CC=CC=C3C4=CC=CC=C4)C)CC5=CC=CC=C5)C'
-        }
-        if lower_name in common_names:
+        # Fallback: built-in structures for a few common drugs
+        common_smiles = _COMMON_SMILES.get(drug_name.lower())
+        if common_smiles:
             try:
-                return Chem.MolFromSmiles(common_names[lower_name])
+                return _mol_from_smiles(common_smiles)
             except Exception:
                 return None
 
@@ -277,7 +501,7 @@ class MoleculeVisualizer:
             if data and 'PropertyTable' in data and data['PropertyTable'].get('Properties'):
                 for prop in data['PropertyTable']['Properties']:
                     if 'CanonicalSMILES' in prop:
-                        mol = Chem.MolFromSmiles(prop['CanonicalSMILES'])
+                        mol = _mol_from_smiles(prop['CanonicalSMILES'])
                         if mol is not None:
                             return mol
         except Exception as e:
@@ -290,13 +514,20 @@ class MoleculeVisualizer:
             return None
 
         try:
-            # First get CIDs for the name
-            endpoint = f"name/{quote_plus(drug_name)}/cids/JSON"
-            data, error = self._make_pubchem_request(endpoint)
+            # Name -> CID is cached on disk, so repeat names skip this round-trip
+            cache_key = f"pubchem:cid:{drug_name.strip().lower()}"
+            cid = _disk_cache_get(cache_key)
+            if cid is None:
+                # First get CIDs for the name
+                endpoint = f"name/{quote_plus(drug_name)}/cids/JSON"
+                data, error = self._make_pubchem_request(endpoint)
+                
+                if data and 'IdentifierList' in data and data['IdentifierList'].get('CID'):
+                    cid = data['IdentifierList']['CID'][0]
+                    _disk_cache_put(cache_key, cid)
             
-            if data and 'IdentifierList' in data and data['IdentifierList'].get('CID'):
+            if cid is not None:
                 # Try to get SMILES for the first CID
-                cid = data['IdentifierList']['CID'][0]
                 return self._get_mol_by_cid(cid)
         except Exception as e:
             st.warning(f"Error in text search: {str(e)}")
@@ -309,35 +540,33 @@ class MoleculeVisualizer:
 
         try:
             # Try with common synonyms
-            common_names = {
-                'aspirin': 'CC(=O)OC1=CC=CC=C1C(=O)O',
-                'ibuprofen': 'CC(C)CC1=CC=C(C=C1)C(C)C(=O)O',
-                'paracetamol': 'CC(=O)NC1=CC=C(C=C1)O',
-                'metformin': 'CN(C)CCN=C(N)N',
-                'atorvastatin': 'CC(C)C(C(=O)O)CC1=CC=C(C=C1)C2=C(C(=C(N2C(=O)C3=CC=CC=C3C4=CC=CC=C4)C)CC5=CC=CC=C5)C'
-            }
-            
-            lower_name = drug_name.lower()
-            if lower_name in common_names:
-                return Chem.MolFromSmiles(common_names[lower_name])
+            common_smiles = _COMMON_SMILES.get(drug_name.lower())
+            if common_smiles:
+                return _mol_from_smiles(common_smiles)
                 
         except Exception as e:
             st.warning(f"Error in SMILES lookup: {str(e)}")
         return None
         
-    def _get_mol_by_cid(self, cid: str) -> Optional[Chem.rdchem.Mol]:
+    def _get_mol_by_cid(self, cid: int) -> Optional[Chem.rdchem.Mol]:
         """Get molecule by PubChem CID."""
         if not self._ensure_rdkit():
             return None
 
         try:
-            endpoint = f"cid/{quote_plus(str(cid))}/property/CanonicalSMILES/JSON"
+            cache_key = f"pubchem:smiles:{cid}"
+            smiles = _disk_cache_get(cache_key)
+            if smiles:
+                return _mol_from_smiles(smiles)
+            
+            endpoint = f"cid/{cid}/property/CanonicalSMILES/JSON"
             data, error = self._make_pubchem_request(endpoint)
             
             if data and 'PropertyTable' in data and data['PropertyTable'].get('Properties'):
                 for prop in data['PropertyTable']['Properties']:
                     if 'CanonicalSMILES' in prop:
-                        return Chem.MolFromSmiles(prop['CanonicalSMILES'])
+                        _disk_cache_put(cache_key, prop['CanonicalSMILES'])
+                        return _mol_from_smiles(prop['CanonicalSMILES'])
         except Exception as e:
             st.warning(f"Error getting molecule by CID: {str(e)}")
         return None
@@ -346,16 +575,16 @@ class MoleculeVisualizer:
         self,
         mol: Union[RDKitMol, Any],
         size: tuple[int, int] = (400, 300)
-    ) -> Optional[Image.Image]:
+    ) -> Optional[str]:
         """
-        Generate a 2D image of the molecule with improved rendering.
+        Generate a 2D SVG drawing of the molecule with improved rendering.
         
         Args:
             mol: RDKit molecule object
             size: Tuple of (width, height) for the output image
             
         Returns:
-            PIL Image object or None if rendering fails
+            SVG markup or None if rendering fails
         """
         if not self._ensure_rdkit():
             return None
@@ -364,24 +593,8 @@ class MoleculeVisualizer:
             return None
             
         try:
-            # Generate 2D coordinates if they don't exist
-            if not mol.GetNumConformers():
-                rdDepictor.Compute2DCoords(mol)
-                
-            # Generate the image with improved parameters
-            img = Draw.MolToImage(
-                mol,
-                size=size,
-                kekulize=True,
-                wedgeBonds=True,
-                imageType='png',
-                fitImage=True,
-                highlightAtoms=[],
-                highlightBonds=[],
-                highlightColor=(0.5, 0.5, 1.0),
-                highlightBondWidthMultiplier=10
-            )
-            return img
+            # Draw as SVG (cached per structure across reruns)
+            return _render_2d_svg(Chem.MolToSmiles(mol), tuple(size))
             
         except Exception as e:
             st.warning(f"Error generating 2D image: {str(e)}")
@@ -406,47 +619,16 @@ class MoleculeVisualizer:
             return None
 
         try:
-            # Make a quick 3D conformer (single embed) and produce an SDF block
-            mol3 = Chem.AddHs(mol)
-            embed_res = AllChem.EmbedMolecule(mol3, randomSeed=42)
-            if embed_res != 0:
+            # Embedding is the slow part; it is cached per structure across reruns
+            sdf = _compute_3d_sdf(Chem.MolToSmiles(mol))
+            if sdf is None:
                 return None
-            try:
-                AllChem.MMFFOptimizeMolecule(mol3, maxIters=120)
-            except Exception:
-                pass
 
-            sdf = Chem.MolToMolBlock(mol3)
-
-            # Build a minimal HTML page that uses 3Dmol.js to render the SDF
-            # Use a JS template and insert the SDF safely (escaped newlines)
-            data_js = sdf.replace('\n', '\\n')
-            html = f'''<html>
-  <head>
-    <meta charset="utf-8" />
-    <script src="https://3dmol.csb.pitt.edu/build/3Dmol-min.js"></script>
-  </head>
-  <body>
-    <div id="viewer" style="width:{width}px; height:{height}px; position: relative;"></div>
-    <script>
-      (function() {{
-        var element = document.getElementById('viewer');
-        var config = {{backgroundColor: '0xffffff'}};
-        var viewer = $3Dmol.createViewer(element, config);
-        var data = `{data_js}`;
-        try {{
-          viewer.addModel(data, 'sdf');
-          viewer.setStyle({{}}, {{stick:{{}}}});
-          viewer.zoomTo();
-          viewer.render();
-        }} catch(e) {{
-          document.body.innerHTML = '<p>Error rendering 3D view</p>';
-        }}
-      }})();
-    </script>
-  </body>
-</html>'''
-            return html
+            # Fill the 3Dmol.js page; json.dumps gives a JS string literal with
+            # newlines and quotes in the SDF escaped, and the translate pass
+            # keeps "</script>" or "<!--" in it from ending the script block
+            data_js = json.dumps(sdf).translate(_SCRIPT_SAFE)
+            return _HTML_3D_TEMPLATE.format(data_js=data_js, width=width, height=height)
         except Exception as e:
             st.warning(f"Error generating 3D visualization: {str(e)}")
             return None
@@ -476,39 +658,20 @@ class MoleculeVisualizer:
                 st.error("RDKit is required for molecular property calculations")
                 return
                 
-            # Use getattr to safely access potentially missing attributes
-            descriptors = {
-                'Molecular Weight': lambda m: getattr(Descriptors, 'ExactMolWt')(m),
-                'LogP': lambda m: getattr(Descriptors, 'MolLogP')(m),
-                'H-Bond Donors': lambda m: getattr(Lipinski, 'NumHDonors')(m),
-                'H-Bond Acceptors': lambda m: getattr(Lipinski, 'NumHAcceptors')(m),
-                'Rotatable Bonds': lambda m: getattr(Lipinski, 'NumRotatableBonds')(m)
-            }
-            
-            properties = {}
-            for name, calc in descriptors.items():
-                try:
-                    value = calc(mol)
-                    properties[name] = round(value, 2) if isinstance(value, float) else value
-                except Exception as e:
-                    st.warning(f"Could not calculate {name}: {str(e)}")
-                    properties[name] = "N/A"
+            # Computed once per structure and cached across reruns
+            properties = _compute_properties(Chem.MolToSmiles(mol))
             
             # Display properties in columns
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Molecular Weight", 
-                         f"{properties['Molecular Weight']} g/mol" 
-                         if properties['Molecular Weight'] != "N/A" 
-                         else "N/A")
-                st.metric("LogP", 
-                         f"{properties['LogP']}" if properties['LogP'] != "N/A" else "N/A")
+                st.metric("Molecular Weight", f"{properties['Molecular Weight']} g/mol")
+                st.metric("LogP", f"{properties['LogP']}")
             with col2:
                 st.metric("H-Bond Donors", properties['H-Bond Donors'])
                 st.metric("H-Bond Acceptors", properties['H-Bond Acceptors'])
             with col3:
                 st.metric("Rotatable Bonds", properties['Rotatable Bonds'])
-                st.metric("Heavy Atoms", mol.GetNumHeavyAtoms())
+                st.metric("Heavy Atoms", properties['Heavy Atoms'])
                 
         except Exception as e:
             st.warning(f"Could not calculate all molecular properties: {str(e)}")
@@ -526,10 +689,9 @@ class MoleculeVisualizer:
 
         with tab1:
             st.subheader("2D Structure")
-            img = self.draw_2d_molecule(mol, size=(600, 400))
-            if img:
-                # Use use_container_width to avoid deprecated width string
-                st.image(img, use_container_width=True)
+            svg = self.draw_2d_molecule(mol, size=(600, 400))
+            if svg:
+                st.image(svg, use_container_width=True)
             else:
                 st.warning("Could not generate 2D visualization")
 
@@ -571,11 +733,11 @@ class MoleculeVisualizer:
             return
 
         try:
-            # Generate SDF file
-            sdf = Chem.MolToMolBlock(mol)
+            # Generate SDF file (cached, since this runs on every rerun)
+            sdf = _mol_to_sdf(Chem.MolToSmiles(mol))
             
             # Create a clean filename
-            clean_name = "".join(c if c.isalnum() else "_" for c in drug_name)
+            clean_name = _NON_ALNUM.sub("_", drug_name)
             
             # Add download button
             st.download_button(